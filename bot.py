@@ -3,22 +3,34 @@ import sys
 import time
 import logging
 import asyncio
+import atexit
+import functools
 import json
+from collections import Counter, OrderedDict, defaultdict, deque
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, List, Union, Tuple, Any
 from pathlib import Path
 
 # Add the current directory to Python path to ensure local imports work
-sys.path.insert(0, str(Path(__file__).parent.absolute()))
+_bot_dir = str(Path(__file__).parent.resolve())
+if _bot_dir not in sys.path:
+    sys.path.insert(0, _bot_dir)
 
 import discord
 from discord.ext import commands
 
-# Import keep_alive from local webserver.py
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from webserver import keep_alive
+# Status pages served on the bot's own event loop (see SecurityBot.setup_hook)
+from webserver import start_webserver
 from error_handling import run_bot_with_error_handling
 
+# Monotonic clock for interval math: unaffected by wall-clock/NTP adjustments
+_now = time.monotonic
+
+# Role membership checks read Member._roles, the sorted SnowflakeList of role
+# IDs that discord.py keeps on every 2.x Member. `role.id in member._roles` and
+# `member._roles.has(role.id)` bisect it directly, while member.roles builds a
+# new list of Role objects from the guild's role cache on every access.
+
 # Custom type definitions for improved clarity
 GuildID = int
 UserID = int
@@ -28,6 +40,21 @@ PermissionList = List[str]
 GuildContext = Union[discord.Guild, None]
 MemberContext = Union[discord.Member, None]
 
+# Embed colors, resolved once instead of through the Color factories per call
+_COLOR_ORANGE = discord.Color.orange()
+_COLOR_RED = discord.Color.red()
+_COLOR_GRAY = discord.Color.dark_gray()
+_COLOR_BLUE = discord.Color.blue()
+_COLOR_YELLOW = discord.Color.yellow()
+_COLOR_GREEN = discord.Color.green()
+
+# Default member permissions for the admin-only slash commands, shared by all of them
+_ADMIN_PERMS = discord.Permissions(administrator=True)
+
+def _lc(text: str) -> str:
+    """Lowercase `text`, skipping the copy when it already is (the usual case for typed options)."""
+    return text if text.islower() else text.lower()
+
 # Set up comprehensive logging to track all bot functions
 logging.basicConfig(
     level=logging.INFO,
@@ -51,18 +78,38 @@ except Exception:
     MANAGER_ROLE_NAME = 'Manager'
     MANAGER_ROLE_IDS = []
 
+# Parse the configured manager role IDs once instead of on every check
+try:
+    _MANAGER_ROLE_IDS = frozenset(int(x) for x in MANAGER_ROLE_IDS)
+except (TypeError, ValueError):
+    _MANAGER_ROLE_IDS = frozenset(MANAGER_ROLE_IDS)
+
+
+# Without configured IDs, the IDs of each guild's roles named MANAGER_ROLE_NAME;
+# dropped by the role create/update/delete events, the only ones that change it
+_manager_role_ids_by_name: Dict[GuildID, frozenset] = {}
+
+
+def _manager_role_ids(guild: discord.Guild) -> frozenset:
+    # If IDs provided, prefer them
+    if _MANAGER_ROLE_IDS:
+        return _MANAGER_ROLE_IDS
+    # Fall back to name match, resolved once per guild
+    ids = _manager_role_ids_by_name.get(guild.id)
+    if ids is None:
+        ids = frozenset(r.id for r in guild.roles if r.name == MANAGER_ROLE_NAME)
+        _manager_role_ids_by_name[guild.id] = ids
+    return ids
+
 
 def is_manager_member(member: discord.Member) -> bool:
     """Return True if member has the configured manager role (by ID or name)."""
-    # If IDs provided, prefer them
-    if MANAGER_ROLE_IDS:
-        try:
-            ids = [int(x) for x in MANAGER_ROLE_IDS]
-        except Exception:
-            ids = MANAGER_ROLE_IDS
-        return any(r.id in ids for r in member.roles)
-    # Fall back to name match
-    return any(r.name == MANAGER_ROLE_NAME for r in member.roles)
+    return not _manager_role_ids(member.guild).isdisjoint(member._roles)
+
+
+def invalidate_manager_roles(guild_id: GuildID):
+    """Forget the manager role IDs resolved by name for a guild."""
+    _manager_role_ids_by_name.pop(guild_id, None)
 
 # Helper functions for punishment application
 async def apply_mute(ctx, member: discord.Member, duration: int, reason: str):
@@ -73,13 +120,13 @@ async def apply_mute(ctx, member: discord.Member, duration: int, reason: str):
         embed = discord.Embed(
             title='Automatic Mute Applied',
             description=f'{member.mention} has been muted for {duration} minutes due to excessive warnings.',
-            color=discord.Color.dark_gray()
+            color=_COLOR_GRAY
         )
         embed.add_field(name='Reason', value=reason, inline=False)
         await ctx.send(embed=embed)
-        command_logger.info(f"auto_mute: SUCCESS - Member {member.name} (ID: {member.id}) muted for {duration} minutes in guild {ctx.guild.name} (ID: {ctx.guild.id}) for reason: {reason}")
+        command_logger.info("auto_mute: SUCCESS - Member %s (ID: %s) muted for %s minutes in guild %s (ID: %s) for reason: %s", member.name, member.id, duration, ctx.guild.name, ctx.guild.id, reason)
     except Exception as e:
-        error_logger.error(f"auto_mute: ERROR - Failed to mute {member.id}: {str(e)}")
+        error_logger.error("auto_mute: ERROR - Failed to mute %s: %s", member.id, e)
         await ctx.send(f'⚠️ Failed to apply automatic mute: {str(e)}')
 
 async def apply_kick(ctx, member: discord.Member, reason: str):
@@ -89,13 +136,13 @@ async def apply_kick(ctx, member: discord.Member, reason: str):
         embed = discord.Embed(
             title='Automatic Kick Applied',
             description=f'{member.mention} has been kicked due to excessive warnings.',
-            color=discord.Color.orange()
+            color=_COLOR_ORANGE
         )
         embed.add_field(name='Reason', value=reason, inline=False)
         await ctx.send(embed=embed)
-        command_logger.info(f"auto_kick: SUCCESS - Member {member.name} (ID: {member.id}) kicked from guild {ctx.guild.name} (ID: {ctx.guild.id}) for reason: {reason}")
+        command_logger.info("auto_kick: SUCCESS - Member %s (ID: %s) kicked from guild %s (ID: %s) for reason: %s", member.name, member.id, ctx.guild.name, ctx.guild.id, reason)
     except Exception as e:
-        error_logger.error(f"auto_kick: ERROR - Failed to kick {member.id}: {str(e)}")
+        error_logger.error("auto_kick: ERROR - Failed to kick %s: %s", member.id, e)
         await ctx.send(f'⚠️ Failed to apply automatic kick: {str(e)}')
 
 async def apply_ban(ctx, member: discord.Member, reason: str):
@@ -105,110 +152,195 @@ async def apply_ban(ctx, member: discord.Member, reason: str):
         embed = discord.Embed(
             title='Automatic Ban Applied',
             description=f'{member.mention} has been banned due to excessive warnings.',
-            color=discord.Color.red()
+            color=_COLOR_RED
         )
         embed.add_field(name='Reason', value=reason, inline=False)
         await ctx.send(embed=embed)
-        command_logger.info(f"auto_ban: SUCCESS - Member {member.name} (ID: {member.id}) banned from guild {ctx.guild.name} (ID: {ctx.guild.id}) for reason: {reason}")
+        command_logger.info("auto_ban: SUCCESS - Member %s (ID: %s) banned from guild %s (ID: %s) for reason: %s", member.name, member.id, ctx.guild.name, ctx.guild.id, reason)
     except Exception as e:
-        error_logger.error(f"auto_ban: ERROR - Failed to ban {member.id}: {str(e)}")
+        error_logger.error("auto_ban: ERROR - Failed to ban %s: %s", member.id, e)
         await ctx.send(f'⚠️ Failed to apply automatic ban: {str(e)}')
 
-intents = discord.Intents.default()
-intents.message_content = True
-intents.members = True
+# Only the gateway events the bot handles: guild/role/channel updates, member
+# joins/updates/removals, bans (moderation), and guild + DM messages with content
+intents = discord.Intents.none()
 intents.guilds = True
+intents.members = True
+intents.moderation = True
+intents.messages = True
+intents.message_content = True
+
+# JSON encoding: prefer orjson (much faster, emits bytes directly) and fall
+# back to the stdlib json module when it is not installed. orjson's
+# JSONDecodeError subclasses json.JSONDecodeError, so callers catch the latter.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def json_loads(raw: bytes) -> Any:
+    """Decode JSON bytes using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def json_dumps(data: Any) -> bytes:
+    """Encode data to pretty-printed JSON bytes using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=4, ensure_ascii=False).encode('utf-8')
 
 # Warnings system
 warnings_file = 'warnings.json'
 warnings_backup_file = 'warnings_backup.json'
 
+def new_warnings_store(raw: Optional[dict] = None) -> defaultdict:
+    """Build the in-memory warnings store, {guild_id: {user_id: count}} keyed by int.
+
+    warnings.json has string keys (JSON object keys always are); they are
+    converted once here so commands index by the raw IDs.
+    """
+    store = defaultdict(lambda: defaultdict(int))
+    for guild_id, users in (raw or {}).items():
+        guild_warnings = store[int(guild_id)]
+        for user_id, count in users.items():
+            guild_warnings[int(user_id)] = count
+    return store
+
 def load_warnings():
     """Load warnings data from file."""
-    if os.path.exists(warnings_file):
+    try:
+        with open(warnings_file, 'rb') as f:
+            data = json_loads(f.read())
+    except FileNotFoundError:
+        return new_warnings_store()
+    except json.JSONDecodeError:
+        # Try to load from backup if main file is corrupted
         try:
-            with open(warnings_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Create backup on successful load
-                try:
-                    with open(warnings_backup_file, 'w', encoding='utf-8') as backup:
-                        json.dump(data, backup, indent=4)
-                except Exception:
-                    pass
-                return data
-        except (json.JSONDecodeError, FileNotFoundError):
-            # Try to load from backup if main file is corrupted
-            if os.path.exists(warnings_backup_file):
-                try:
-                    logger.warning("Main warnings file corrupted, loading from backup...")
-                    with open(warnings_backup_file, 'r', encoding='utf-8') as f:
-                        return json.load(f)
-                except Exception:
-                    pass
-            return {}
-    return {}
+            with open(warnings_backup_file, 'rb') as f:
+                logger.warning("Main warnings file corrupted, loading from backup...")
+                return new_warnings_store(json_loads(f.read()))
+        except Exception:
+            return new_warnings_store()
+    # The backup is maintained by save_warnings; loading never rewrites it
+    return new_warnings_store(data)
 
 import tempfile
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+# All file writes run on this one worker thread, off the event loop. A single
+# worker keeps saves of the same file in submission order (a later flush can
+# never be overwritten by an earlier one) and serializes _last_written access.
+_write_executor = ThreadPoolExecutor(max_workers=1)
+
+# hash() of the payload last written to each file, so unchanged data is not rewritten
+_last_written: Dict[str, int] = {}
+
+def write_bytes_atomic(filename: str, payload: bytes):
+    """Write bytes to filename via a temp file and atomic replace."""
+    digest = hash(payload)
+    if _last_written.get(filename) == digest:
+        return
+
+    # Write to a temp file in the same directory first to avoid corruption.
+    # The payload is already encoded, so it goes straight to the raw fd (one
+    # write syscall for anything but huge files, no buffered-file layer). It
+    # is not fsynced: the atomic replace already rules out a torn file.
+    dir_path = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(dir=dir_path)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    except BaseException:
+        os.close(fd)
+        os.remove(tmp_path)
+        raise
+    os.close(fd)
+
+    # Atomic replace (same filesystem, so no copy fallback is needed)
+    os.replace(tmp_path, filename)
+    _last_written[filename] = digest
+
+def copy_file_atomic(src: str, dst: str):
+    """Make dst a copy of src, via a hardlink when the filesystem allows it."""
+    # The main file is always replaced (new inode) on save, so a hardlinked
+    # backup keeps its contents when the main file is next written.
+    tmp_path = f"{dst}.tmp"
+    try:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        os.link(src, tmp_path)
+        os.replace(tmp_path, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
 
 async def save_json_async(filename: str, data: dict):
     """Save JSON data asynchronously and atomically."""
-    def _write_json():
-        # Write to a temp file first to avoid corruption
-        dir_path = os.path.dirname(os.path.abspath(filename))
-        with tempfile.NamedTemporaryFile('w', dir=dir_path, delete=False, encoding='utf-8') as tmp:
-            json.dump(data, tmp, indent=4, ensure_ascii=False)
-            tmp_path = tmp.name
-        
-        # Atomic replace
-        shutil.move(tmp_path, filename)
-
     try:
-        await bot.loop.run_in_executor(None, _write_json)
+        # Encode on the event loop so the snapshot is consistent with in-memory
+        # state (no concurrent mutation from other coroutines); only the file
+        # I/O is handed to the writer thread.
+        payload = json_dumps(data)
+        await bot.loop.run_in_executor(_write_executor, write_bytes_atomic, filename, payload)
     except Exception as e:
-        logger.error(f"Failed to save {filename}: {e}")
+        logger.error("Failed to save %s: %s", filename, e)
         raise
 
 def save_json_sync(filename: str, data: dict):
     """Save JSON data synchronously and atomically (for emergency backups)."""
     try:
-        dir_path = os.path.dirname(os.path.abspath(filename))
-        with tempfile.NamedTemporaryFile('w', dir=dir_path, delete=False, encoding='utf-8') as tmp:
-            json.dump(data, tmp, indent=4, ensure_ascii=False)
-            tmp_path = tmp.name
-        shutil.move(tmp_path, filename)
+        write_bytes_atomic(filename, json_dumps(data))
     except Exception as e:
-        logger.error(f"Failed to save {filename} synchronously: {e}")
+        logger.error("Failed to save %s synchronously: %s", filename, e)
+
+# Set whenever warnings_data changes; cleared once a save has snapshotted it.
+# Commands only mark the data dirty; flush_pending_saves writes it out.
+warnings_dirty = False
+FLUSH_INTERVAL = 5  # Seconds between flushes of unsaved warnings/settings
+WARNINGS_BACKUP_INTERVAL = 1800  # Seconds between warnings backup rotations
+
+def mark_warnings_dirty():
+    """Flag warnings data as modified since the last save."""
+    global warnings_dirty
+    warnings_dirty = True
 
 async def save_warnings(warnings, create_backup=True):
     """Save warnings data to file with backup."""
+    global warnings_dirty
     try:
         # Save to main file
+        warnings_dirty = False
         await save_json_async(warnings_file, warnings)
         
-        # Create backup
+        # Create backup from the file just written instead of re-encoding
         if create_backup:
             try:
-                await save_json_async(warnings_backup_file, warnings)
+                await bot.loop.run_in_executor(_write_executor, copy_file_atomic, warnings_file, warnings_backup_file)
             except Exception as e:
-                logger.warning(f"Failed to create backup: {e}")
+                logger.warning("Failed to create backup: %s", e)
     except Exception as e:
-        logger.error(f"Failed to save warnings: {e}")
+        warnings_dirty = True
+        logger.error("Failed to save warnings: %s", e)
 
 def save_warnings_sync(warnings, create_backup=True):
     """Save warnings data synchronously (for emergency backups)."""
     try:
         save_json_sync(warnings_file, warnings)
         if create_backup:
-            save_json_sync(warnings_backup_file, warnings)
+            copy_file_atomic(warnings_file, warnings_backup_file)
     except Exception as e:
-        logger.error(f"Failed to save warnings synchronously: {e}")
+        logger.error("Failed to save warnings synchronously: %s", e)
 
 warnings_data = load_warnings()
-logger.info(f"Loaded {sum(len(guild_data) for guild_data in warnings_data.values())} user warnings from {len(warnings_data)} guilds")
+logger.info("Loaded %s user warnings from %s guilds", sum(len(guild_data) for guild_data in warnings_data.values()), len(warnings_data))
 
 # Security system (Anti-nuke & Anti-spam)
 security_file = 'security_settings.json'
+security_dirty = False  # Same debounce scheme as warnings_dirty
 
 def load_security_settings():
     """Load security settings from file."""
@@ -228,93 +360,287 @@ def load_security_settings():
         'log_channel': None  # Channel ID for security logs
     }
     
-    if os.path.exists(security_file):
-        try:
-            with open(security_file, 'r', encoding='utf-8') as f:
-                settings = json.load(f)
-                # Merge with defaults to ensure all keys exist
-                for key, value in default_settings.items():
-                    if key not in settings:
-                        settings[key] = value
-                return settings
-        except (json.JSONDecodeError, FileNotFoundError):
-            return default_settings
-    return default_settings
+    try:
+        with open(security_file, 'rb') as f:
+            settings = json_loads(f.read())
+    except (json.JSONDecodeError, FileNotFoundError):
+        return default_settings
+
+    # Merge with defaults to ensure all keys exist
+    for key, value in default_settings.items():
+        if key not in settings:
+            settings[key] = value
+    return settings
 
 async def save_security_settings(settings):
     """Save security settings to file."""
+    global security_dirty
+    _refresh_sec_cache()
     try:
+        security_dirty = False
         await save_json_async(security_file, settings)
     except Exception as e:
-        logger.error(f"Failed to save security settings: {e}")
+        security_dirty = True
+        logger.error("Failed to save security settings: %s", e)
+
+# Settings edits come from admins in short bursts (several /antispam calls in a
+# row), so they are written SECURITY_SAVE_DELAY seconds after the first change
+# of a burst rather than waiting for the next FLUSH_INTERVAL tick
+SECURITY_SAVE_DELAY = 0.5
+_pending_security_save: Optional[asyncio.Task] = None
+
+async def _delayed_security_flush(delay: float):
+    """Save security settings once after `delay`, covering every change made meanwhile."""
+    global _pending_security_save
+    try:
+        await asyncio.sleep(delay)
+    finally:
+        _pending_security_save = None
+    if security_dirty:
+        await save_security_settings(security_settings)
+
+def schedule_security_save():
+    """Queue one coalesced save of security_settings unless one is already pending."""
+    global _pending_security_save
+    if _pending_security_save is None:
+        _pending_security_save = asyncio.create_task(_delayed_security_flush(SECURITY_SAVE_DELAY))
+
+def mark_security_dirty():
+    """Apply a security_settings change now and schedule it to be saved."""
+    global security_dirty
+    _refresh_sec_cache()
+    security_dirty = True
+    schedule_security_save()
+
+class _SecCache:
+    """Snapshot of the security settings read on every message/event."""
+    __slots__ = (
+        'antispam_enabled', 'time_window', 'message_limit', 'mention_limit',
+        'duplicate_limit', 'action', 'mute_duration', 'whitelisted_role_ids',
+        'antinuke_enabled', 'antinuke_ban_threshold', 'antinuke_kick_threshold',
+        'antinuke_time_window',
+    )
+
+_SEC = _SecCache()
+
+# The /antinuke settings embed only changes when the settings do, so it is
+# built on first display and dropped whenever _SEC is refreshed
+_antinuke_embed_cache: Optional[discord.Embed] = None
+
+def _refresh_sec_cache():
+    """Rebuild the _SEC snapshot from security_settings (call after any change)."""
+    global _antinuke_embed_cache
+    _antinuke_embed_cache = None
+    s = security_settings
+    _SEC.antispam_enabled = s.get('antispam_enabled', True)
+    _SEC.time_window = s.get('antispam_time_window', 5)
+    _SEC.message_limit = s.get('antispam_message_limit', 5)
+    _SEC.mention_limit = s.get('antispam_mention_limit', 5)
+    _SEC.duplicate_limit = s.get('antispam_duplicate_limit', 3)
+    _SEC.action = s.get('antispam_action', 'mute')
+    _SEC.mute_duration = s.get('antispam_mute_duration', 10)
+    _SEC.whitelisted_role_ids = frozenset(int(rid) for rid in s.get('whitelisted_roles', []))
+    _SEC.antinuke_enabled = s.get('antinuke_enabled', True)
+    _SEC.antinuke_ban_threshold = int(s.get('antinuke_ban_threshold', 5))
+    _SEC.antinuke_kick_threshold = int(s.get('antinuke_kick_threshold', 3))
+    _SEC.antinuke_time_window = int(s.get('antinuke_time_window', 10))
 
 security_settings = load_security_settings()
+_refresh_sec_cache()
 
 # Track user actions for anti-nuke
-user_action_tracker = {}  # {guild_id: {user_id: [(action_type, timestamp), ...]}}
+# Flat (guild_id, user_id) keys: one dict lookup per event instead of two levels.
+# All action types share a window, so a mixed ban/kick/delete spree counts together.
+user_action_tracker: Dict[Tuple[GuildID, UserID], deque] = defaultdict(deque)  # {(guild_id, user_id): deque([timestamp, ...])}
 
 # Track spam activity
-spam_tracker = {}  # {guild_id: {user_id: {'messages': [(content, timestamp), ...], 'last_message': timestamp}}}
+spam_tracker = {}  # {guild_id: {user_id: {'messages': deque([(content_hash, timestamp, message_id, channel_id), ...]), 'hashes': Counter, 'last_message': timestamp}}}
+
+def new_spam_entry() -> dict:
+    """Create an empty per-user anti-spam tracking entry."""
+    # 'hashes' counts the content hashes currently in 'messages' so duplicate
+    # lookups are O(1) instead of a scan over recent message strings.
+    return {'messages': deque(), 'hashes': Counter(), 'last_message': 0}
+
+async def delete_spam_messages(message: discord.Message, tracked) -> None:
+    """Delete a spam message and the user's tracked burst, one bulk request per channel."""
+    by_channel: Dict[int, List[int]] = {message.channel.id: [message.id]}
+    for _, _, message_id, channel_id in tracked:
+        by_channel.setdefault(channel_id, []).append(message_id)
+
+    for channel_id, message_ids in by_channel.items():
+        if channel_id == message.channel.id:
+            channel = message.channel
+        else:
+            channel = message.guild.get_channel_or_thread(channel_id)
+        if channel is None:
+            continue
+        try:
+            if len(message_ids) == 1:
+                await channel.get_partial_message(message_ids[0]).delete()
+            else:
+                # Tracked messages are seconds old, well inside the 14-day bulk-delete limit
+                await channel.delete_messages([discord.Object(id=i) for i in message_ids[:100]])
+        except discord.HTTPException as e:
+            logger.debug("Could not delete spam messages in channel %s: %s", channel_id, e)
 
 # Track unknown commands to prevent spam
-unknown_command_tracker = {}  # {user_id: {'count': int, 'last_time': float}}
+# Kept in least-recently-used order and capped, so it cannot grow without bound
+UNKNOWN_COMMAND_TRACKER_SIZE = 4096
+unknown_command_tracker: 'OrderedDict[UserID, dict]' = OrderedDict()  # {user_id: {'count': int, 'last_time': float}}
+
+def touch_unknown_command(user_id: UserID) -> dict:
+    """Return the user's unknown-command entry, marking it most recently used."""
+    entry = unknown_command_tracker.get(user_id)
+    if entry is None:
+        if len(unknown_command_tracker) >= UNKNOWN_COMMAND_TRACKER_SIZE:
+            unknown_command_tracker.popitem(last=False)
+        entry = unknown_command_tracker[user_id] = {'count': 0, 'last_time': 0}
+    else:
+        unknown_command_tracker.move_to_end(user_id)
+    return entry
 
 def is_whitelisted(member: discord.Member) -> bool:
     """Check if member is whitelisted from security checks."""
-    if not security_settings.get('whitelisted_roles', []):
-        return False
-    whitelisted_ids = [int(rid) for rid in security_settings.get('whitelisted_roles', [])]
-    return any(role.id in whitelisted_ids for role in member.roles)
+    # member._roles holds the raw role IDs, avoiding Role object lookups
+    return not _SEC.whitelisted_role_ids.isdisjoint(member._roles)
+
+# Members holding a whitelisted role, per guild, so anti-spam can skip them
+# with one set lookup. Kept current by on_member_update and whitelist changes.
+spam_exempt_members: Dict[GuildID, set] = {}
+
+def rebuild_spam_exempt(guild: discord.Guild):
+    """Recompute the anti-spam exempt member set for a guild."""
+    if not guild.chunked:
+        # A partial member cache would miss exempt members; is_spam_exempt
+        # checks roles directly until the guild has been chunked
+        spam_exempt_members.pop(guild.id, None)
+        return
+    spam_exempt_members[guild.id] = {m.id for m in guild.members if is_whitelisted(m)}
+
+def rebuild_all_spam_exempt():
+    """Recompute the anti-spam exempt member sets for every guild."""
+    for guild in bot.guilds:
+        rebuild_spam_exempt(guild)
+
+async def ensure_chunked(guild: discord.Guild):
+    """Fetch the full member list for guild if it has not been loaded yet."""
+    if guild.chunked:
+        return
+    await guild.chunk()
+    rebuild_spam_exempt(guild)
+
+def is_spam_exempt(member: discord.Member) -> bool:
+    """Check if member is exempt from anti-spam, falling back to a role check."""
+    exempt = spam_exempt_members.get(member.guild.id)
+    if exempt is None:
+        return is_whitelisted(member)
+    return member.id in exempt
 
 async def handle_antinuke_violation(guild: discord.Guild, user: discord.Member, action_count: int):
     """Handle anti-nuke violation by banning/kicking the offender."""
     try:
-        if not security_settings.get('antinuke_enabled', True):
+        sc = _SEC
+        if not sc.antinuke_enabled:
             return
         
         if is_whitelisted(user):
             return
         
-        ban_threshold = security_settings.get('antinuke_ban_threshold', 5)
-        kick_threshold = security_settings.get('antinuke_kick_threshold', 3)
+        ban_threshold = sc.antinuke_ban_threshold
+        kick_threshold = sc.antinuke_kick_threshold
         
         reason = f"Anti-nuke protection: {action_count} suspicious actions detected"
         
         if action_count >= ban_threshold:
             try:
                 await user.ban(reason=reason, delete_message_days=0)
-                logger.warning(f"ANTI-NUKE: Banned {user} (ID: {user.id}) in guild {guild.id} for {action_count} actions")
+                logger.warning("ANTI-NUKE: Banned %s (ID: %s) in guild %s for %s actions", user, user.id, guild.id, action_count)
             except Exception as e:
-                logger.error(f"Failed to ban nuker {user.id}: {e}")
+                logger.error("Failed to ban nuker %s: %s", user.id, e)
         elif action_count >= kick_threshold:
             try:
                 await user.kick(reason=reason)
-                logger.warning(f"ANTI-NUKE: Kicked {user} (ID: {user.id}) in guild {guild.id} for {action_count} actions")
+                logger.warning("ANTI-NUKE: Kicked %s (ID: %s) in guild %s for %s actions", user, user.id, guild.id, action_count)
             except Exception as e:
-                logger.error(f"Failed to kick nuker {user.id}: {e}")
+                logger.error("Failed to kick nuker %s: %s", user.id, e)
     except Exception as e:
-        logger.error(f"Error handling anti-nuke violation: {e}")
+        logger.error("Error handling anti-nuke violation: %s", e)
+
+# Recent audit-log pages per (guild, action). A nuke fires bursts of identical
+# events; sharing one fetch across the burst avoids an audit-log request each.
+AUDIT_CACHE_TTL = 2.0  # Seconds a fetched page is reused
+AUDIT_FETCH_LIMIT = 5
+AUDIT_ENTRY_MAX_AGE = timedelta(seconds=10)  # Older entries are not the event being handled
+audit_cache: Dict[Tuple[GuildID, discord.AuditLogAction], Tuple[float, asyncio.Task]] = {}
+
+async def _fetch_audit(guild: discord.Guild, action: discord.AuditLogAction) -> Tuple[float, list]:
+    # Stamp the request before it goes out; the page holds every entry logged
+    # before this time
+    requested_at = _now()
+    return requested_at, [entry async for entry in guild.audit_logs(limit=AUDIT_FETCH_LIMIT, action=action)]
+
+async def get_recent_audit(guild: discord.Guild, action: discord.AuditLogAction, target_id: int) -> list:
+    """Return recent audit-log entries for `action`, reusing a fetch for AUDIT_CACHE_TTL.
+
+    Discord logs the entry before it sends the event, so a fetch requested
+    after this call started already covers it, as does a page that holds a
+    fresh entry for `target_id`. Such a page, finished or still in flight, is
+    shared; otherwise the page is fetched again.
+    """
+    called_at = _now()
+    key = (guild.id, action)
+    cached = audit_cache.get(key)
+    if cached is not None and called_at < cached[0]:
+        try:
+            requested_at, entries = await cached[1]
+        except Exception:
+            entries = None
+        if entries is not None and (requested_at >= called_at
+                                    or find_audit_entry(entries, target_id, include_own=True) is not None):
+            return entries
+
+    task = asyncio.ensure_future(_fetch_audit(guild, action))
+    audit_cache[key] = (_now() + AUDIT_CACHE_TTL, task)
+    try:
+        return (await task)[1]
+    except Exception:
+        if audit_cache.get(key, (None, None))[1] is task:
+            del audit_cache[key]
+        raise
+
+def find_audit_entry(entries: list, target_id: int, include_own: bool = False):
+    """The first entry in `entries` for `target_id` logged within AUDIT_ENTRY_MAX_AGE, or None.
+
+    Unless `include_own` is set, returns None when that entry was made by the
+    bot itself.
+    """
+    # Entries are newest first, and an older entry for the same target (say,
+    # an earlier kick of a member who rejoined) must not be counted again
+    oldest = discord.utils.utcnow() - AUDIT_ENTRY_MAX_AGE
+    for entry in entries:
+        if entry.created_at < oldest:
+            break
+        if entry.target is not None and entry.target.id == target_id:
+            # The bot's own actions (spam cleanup, automatic punishments) are
+            # never a nuke; the event was ours, so there is no one to track
+            if not include_own and entry.user is not None and bot.user is not None and entry.user.id == bot.user.id:
+                return None
+            return entry
+    return None
 
 def track_user_action(guild_id: int, user_id: int, action_type: str):
     """Track user action for anti-nuke detection."""
-    if guild_id not in user_action_tracker:
-        user_action_tracker[guild_id] = {}
-    if user_id not in user_action_tracker[guild_id]:
-        user_action_tracker[guild_id][user_id] = []
-    
-    current_time = time.time()
-    time_window = security_settings.get('antinuke_time_window', 10)
-    
-    # Add new action
-    user_action_tracker[guild_id][user_id].append((action_type, current_time))
-    
-    # Remove old actions outside time window
-    user_action_tracker[guild_id][user_id] = [
-        (action, timestamp) for action, timestamp in user_action_tracker[guild_id][user_id]
-        if current_time - timestamp < time_window
-    ]
-    
-    return len(user_action_tracker[guild_id][user_id])
+    actions = user_action_tracker[(guild_id, user_id)]
+    current_time = _now()
+    cutoff = current_time - _SEC.antinuke_time_window
+
+    # Remove old actions outside time window (oldest are on the left)
+    while actions and actions[0] <= cutoff:
+        actions.popleft()
+    actions.append(current_time)
+
+    return len(actions)
 
 # Master control system
 try:
@@ -322,32 +648,35 @@ try:
 except ImportError:
     MAIN_OWNER_ID = os.getenv('MAIN_OWNER_ID', 'YOUR_USER_ID_HERE')
 
+try:
+    from config import DEV_GUILD_ID
+except ImportError:
+    DEV_GUILD_ID = os.getenv('DEV_GUILD_ID')
+DEV_GUILD_ID = int(DEV_GUILD_ID) if DEV_GUILD_ID else None
+
 
 # Bot state persistence
 bot_state_file = 'bot_state.json'
 
 def load_bot_state():
     """Load bot state from file."""
-    if os.path.exists(bot_state_file):
-        try:
-            with open(bot_state_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            pass
-    return {'enabled': False}
+    try:
+        with open(bot_state_file, 'rb') as f:
+            return json_loads(f.read())
+    except (json.JSONDecodeError, FileNotFoundError):
+        return {'enabled': False}
 
-def save_bot_state(state):
+async def save_bot_state(state):
     """Save bot state to file."""
     try:
-        with open(bot_state_file, 'w', encoding='utf-8') as f:
-            json.dump(state, f, indent=4)
+        await save_json_async(bot_state_file, state)
     except Exception as e:
-        logger.error(f"Failed to save bot state: {e}")
+        logger.error("Failed to save bot state: %s", e)
 
 # Load bot state from file
 bot_state = load_bot_state()
 botEnabled = bot_state.get('enabled', False)  # Load saved state or default to False
-logger.info(f"Bot state loaded: {'ENABLED' if botEnabled else 'DISABLED'}")
+logger.info("Bot state loaded: %s", 'ENABLED' if botEnabled else 'DISABLED')
 
 
 def is_owner(user_id: int) -> bool:
@@ -358,87 +687,159 @@ def is_owner(user_id: int) -> bool:
             if MAIN_OWNER_ID.isdigit():
                 owner_id = int(MAIN_OWNER_ID)
             else:
-                logger.warning(f"MAIN_OWNER_ID is not a valid number string: {MAIN_OWNER_ID}")
+                logger.warning("MAIN_OWNER_ID is not a valid number string: %s", MAIN_OWNER_ID)
                 return False
         elif isinstance(MAIN_OWNER_ID, int):
             owner_id = MAIN_OWNER_ID
         else:
-            logger.warning(f"MAIN_OWNER_ID is invalid type: {type(MAIN_OWNER_ID)}, value: {MAIN_OWNER_ID}")
+            logger.warning("MAIN_OWNER_ID is invalid type: %s, value: %s", type(MAIN_OWNER_ID), MAIN_OWNER_ID)
             return False
         
         result = (owner_id == user_id)
         if not result:
-            logger.debug(f"Owner check failed: user_id={user_id}, owner_id={owner_id}, MAIN_OWNER_ID={MAIN_OWNER_ID}")
+            logger.debug("Owner check failed: user_id=%s, owner_id=%s, MAIN_OWNER_ID=%s", user_id, owner_id, MAIN_OWNER_ID)
         return result
     except (ValueError, AttributeError, TypeError) as e:
-        logger.error(f"Error checking owner: {e}, MAIN_OWNER_ID={MAIN_OWNER_ID}, user_id={user_id}")
+        logger.error("Error checking owner: %s, MAIN_OWNER_ID=%s, user_id=%s", e, MAIN_OWNER_ID, user_id)
         return False
 
 # Command cooldowns
 command_cooldowns = {}  # Store last usage time for each user
 COOLDOWN_TIME = 3  # seconds between commands per user
 
-def check_cooldown(ctx):
+def check_cooldown(ctx, is_dm: bool = False):
     """Check if user is on cooldown."""
-    if not isinstance(ctx.channel, discord.DMChannel):  # Skip cooldown in DMs
-        current_time = time.time()
-        user_id = ctx.author.id
-        if user_id in command_cooldowns:
-            time_diff = current_time - command_cooldowns[user_id]
-            if time_diff < COOLDOWN_TIME:
-                return False
-        command_cooldowns[user_id] = current_time
+    if is_dm:  # Skip cooldown in DMs
+        return True
+    current_time = _now()
+    user_id = ctx.author.id
+    if user_id in command_cooldowns:
+        time_diff = current_time - command_cooldowns[user_id]
+        if time_diff < COOLDOWN_TIME:
+            return False
+    command_cooldowns[user_id] = current_time
     return True
 
+# How often expired tracker entries are dropped (seconds)
+TRACKER_PRUNE_INTERVAL = 60
+
+def prune_trackers():
+    """Drop expired cooldown, unknown-command and anti-spam entries to bound memory."""
+    current_time = _now()
+
+    expired = [uid for uid, last in command_cooldowns.items() if current_time - last >= COOLDOWN_TIME]
+    for user_id in expired:
+        del command_cooldowns[user_id]
+
+    # Oldest entries come first, so stop at the first one still in its window
+    while unknown_command_tracker:
+        user_id, data = next(iter(unknown_command_tracker.items()))
+        if current_time - data['last_time'] <= 300:
+            break
+        del unknown_command_tracker[user_id]
+
+    expired = [key for key, (expires_at, _) in audit_cache.items() if current_time >= expires_at]
+    for key in expired:
+        del audit_cache[key]
+
+    # A user whose last message is outside the window has nothing left to track
+    time_window = _SEC.time_window
+    for guild_id, users in list(spam_tracker.items()):
+        expired = [uid for uid, data in users.items() if current_time - data['last_message'] >= time_window]
+        for user_id in expired:
+            del users[user_id]
+        if not users:
+            del spam_tracker[guild_id]
+
 # Track bot health
-last_heartbeat = datetime.now(timezone.utc)
+last_heartbeat = _now()  # Monotonic time of the last healthy heartbeat
 is_ready = False
 
-bot = commands.Bot(
+class SecurityBot(commands.Bot):
+    """Bot that also runs the status webserver for as long as it is connected."""
+
+    web_runner = None
+
+    async def setup_hook(self) -> None:
+        # Called on every login, so an in-process restart brings it back up
+        self.web_runner = await start_webserver()
+
+    async def close(self) -> None:
+        if self.web_runner is not None:
+            await self.web_runner.cleanup()
+            self.web_runner = None
+        await super().close()
+
+# Guilds are chunked at startup: the anti-nuke handlers need audit-log actors
+# to resolve to cached Members, and on_member_remove only fires for cached
+# members. ensure_chunked covers commands that run before chunking finishes.
+bot = SecurityBot(
     command_prefix='S',
     intents=intents,
     help_command=None
 )
 
+async def safe_send(ctx, content, ephemeral=False):
+    """Reply to a prefix or slash invocation, using a followup if the interaction was already answered."""
+    try:
+        if ctx.interaction:
+            if not ctx.interaction.response.is_done():
+                await ctx.interaction.response.send_message(content, ephemeral=ephemeral)
+            else:
+                await ctx.interaction.followup.send(content, ephemeral=ephemeral)
+        else:
+            await ctx.send(content)
+    except Exception as e:
+        logger.error("Error sending message for command '%s': %s", ctx.command.name if ctx.command else 'Unknown', e)
+
+def require_defer(func=None, *, ephemeral: bool = False):
+    """Defer the interaction before running a slow hybrid command.
+
+    Slash invocations must be answered within 3 seconds; once deferred,
+    ctx.send goes out as a followup. Prefix invocations are unaffected.
+    """
+    def decorator(callback):
+        @functools.wraps(callback)
+        async def wrapper(ctx, *args, **kwargs):
+            if ctx.interaction is not None and not ctx.interaction.response.is_done():
+                await ctx.defer(ephemeral=ephemeral)
+            return await callback(ctx, *args, **kwargs)
+        return wrapper
+    return decorator(func) if func is not None else decorator
+
 @bot.before_invoke
 async def before_command(ctx):
     global botEnabled
 
+    is_dm = ctx.guild is None
+
     # Reset unknown command count on successful command invocation
     user_id = ctx.author.id
     if user_id in unknown_command_tracker:
         unknown_command_tracker[user_id]['count'] = 0
 
-    command_logger.info(f"Command '{ctx.command.name}' invoked by {ctx.author} (ID: {ctx.author.id}) in guild '{ctx.guild.name if ctx.guild else 'DM'}' (ID: {ctx.guild.id if ctx.guild else 'N/A'})")
-
-    # Helper to safely send messages
-    async def safe_send(content, ephemeral=False):
-        try:
-            if ctx.interaction:
-                if not ctx.interaction.response.is_done():
-                    await ctx.interaction.response.send_message(content, ephemeral=ephemeral)
-                else:
-                    await ctx.interaction.followup.send(content, ephemeral=ephemeral)
-            else:
-                await ctx.send(content)
-        except Exception as e:
-            logger.error(f"Error sending message in before_invoke: {e}")
+    if command_logger.isEnabledFor(logging.INFO):
+        if is_dm:
+            command_logger.info("Command '%s' invoked by %s (ID: %s) in DM", ctx.command.name, ctx.author, user_id)
+        else:
+            command_logger.info("Command '%s' invoked by %s (ID: %s) in guild '%s' (ID: %s)",
+                                ctx.command.name, ctx.author, user_id, ctx.guild.name, ctx.guild.id)
 
     # Check if command is owner-only (Swork or Sstop)
-    if hasattr(ctx.command, 'owner_only') and ctx.command.owner_only:
+    if ctx.command.extras.get('owner_only'):
         if not is_owner(ctx.author.id):
-            await safe_send('❌ You do not have permission to use this command.', ephemeral=True)
+            await safe_send(ctx, '❌ You do not have permission to use this command.', ephemeral=True)
             raise commands.CommandError('OwnerOnly')
 
     # Check if bot is enabled (except for Swork command)
     if not botEnabled and ctx.command.name != 'work':
-        await safe_send('❌ Bot is disabled. Use Swork to enable it.', ephemeral=True)
+        await safe_send(ctx, '❌ Bot is disabled. Use Swork to enable it.', ephemeral=True)
         raise commands.CommandError('BotDisabled')
 
-    if not check_cooldown(ctx):
-        remaining = COOLDOWN_TIME - (time.time() - command_cooldowns.get(ctx.author.id, 0))
-        command_logger.warning(f"Command '{ctx.command.name}' blocked due to cooldown for user {ctx.author.id}, remaining: {remaining:.1f}s")
-        await safe_send(f'⏳ Please wait {remaining:.1f}s before using another command.', ephemeral=True)
+    if not check_cooldown(ctx, is_dm):
+        remaining = COOLDOWN_TIME - (_now() - command_cooldowns.get(ctx.author.id, 0))
+        command_logger.warning("Command '%s' blocked due to cooldown for user %s, remaining: %.1fs", ctx.command.name, ctx.author.id, remaining)
+        await safe_send(ctx, f'⏳ Please wait {remaining:.1f}s before using another command.', ephemeral=True)
         raise commands.CommandError('Cooldown')
 
 async def check_heartbeat() -> None:
@@ -460,65 +861,129 @@ async def check_heartbeat() -> None:
             if bot.is_ready() and bot.latency < 10:  # Bot is responsive
                 # Update heartbeat and reset retry count
                 global last_heartbeat
-                last_heartbeat = datetime.now(timezone.utc)
+                last_heartbeat = _now()
                 retry_count = 0
                 logger.debug("Bot heartbeat check passed")
             else:
                 # Check if we've exceeded timeout threshold
-                time_since_heartbeat = (datetime.now(timezone.utc) - last_heartbeat).total_seconds()
+                time_since_heartbeat = _now() - last_heartbeat
                 if time_since_heartbeat > 120:  # 2 minutes timeout (increased from 60)
-                    logger.error(f"Bot heartbeat timeout detected - {time_since_heartbeat:.1f}s since last heartbeat")
+                    logger.error("Bot heartbeat timeout detected - %.1fs since last heartbeat", time_since_heartbeat)
 
                     if retry_count < max_retries:
                         retry_count += 1
-                        logger.warning(f"Attempting restart (Attempt {retry_count}/{max_retries})")
-                        await bot.close()
+                        logger.warning("Attempting restart (Attempt %s/%s)", retry_count, max_retries)
+                        # Sets bot.restart_requested, so the run loop reconnects
+                        await restart_bot()
                         break  # Exit the loop to allow restart
                     else:
                         logger.critical("Max retry attempts reached. Manual intervention required.")
                         break
                 else:
-                    logger.warning(f"Bot appears unresponsive but within timeout window ({time_since_heartbeat:.1f}s)")
+                    logger.warning("Bot appears unresponsive but within timeout window (%.1fs)", time_since_heartbeat)
 
         except asyncio.CancelledError:
             logger.info("Heartbeat check cancelled - shutting down")
             break
 
         except Exception as e:
-            logger.error(f"Error in heartbeat check: {str(e)}", exc_info=True)
+            logger.error("Error in heartbeat check: %s", e, exc_info=True)
             retry_count += 1
 
             if retry_count >= max_retries:
                     logger.critical("Heartbeat check failing consistently. Manual intervention required.")
                     break
 
-async def auto_save_warnings():
-    """Periodically auto-save warnings data to prevent data loss."""
+async def prune_trackers_task():
+    """Periodically prune the in-memory rate-limit and spam trackers."""
+    while True:
+        try:
+            await asyncio.sleep(TRACKER_PRUNE_INTERVAL)
+            prune_trackers()
+        except asyncio.CancelledError:
+            break
+        except Exception as e:
+            logger.error("Error pruning trackers: %s", e)
+
+async def sweep_action_tracker():
+    """Periodically trim expired anti-nuke actions and drop idle users."""
+    # track_user_action only trims the user it is recording, so users who
+    # stop acting would otherwise keep their deque forever.
+    while True:
+        try:
+            time_window = _SEC.antinuke_time_window
+            await asyncio.sleep(time_window)
+            cutoff = _now() - time_window
+            for key, actions in list(user_action_tracker.items()):
+                while actions and actions[0] <= cutoff:
+                    actions.popleft()
+                if not actions:
+                    del user_action_tracker[key]
+        except asyncio.CancelledError:
+            break
+        except Exception as e:
+            logger.error("Error sweeping anti-nuke tracker: %s", e)
+
+# Background tasks by name, so reconnects (on_ready fires again) don't start duplicates
+background_tasks: Dict[str, asyncio.Task] = {}
+
+def start_background_task(name: str, coro_func) -> None:
+    """Start coro_func() as a named background task unless it is already running."""
+    task = background_tasks.get(name)
+    if task is not None and not task.done():
+        return
+    background_tasks[name] = bot.loop.create_task(coro_func())
+
+async def flush_pending_saves():
+    """Write out warnings and security settings changed since the last flush."""
+    last_backup = _now()
     while True:
         try:
-            await asyncio.sleep(300)  # Save every 5 minutes
-            if warnings_data:
-                await save_warnings(warnings_data)
-                logger.debug("Auto-saved warnings data")
+            await asyncio.sleep(FLUSH_INTERVAL)
+            if warnings_dirty:
+                now = _now()
+                backup = now - last_backup >= WARNINGS_BACKUP_INTERVAL
+                await save_warnings(warnings_data, create_backup=backup)
+                if backup:
+                    last_backup = now
+                logger.debug("Flushed warnings data")
+            if security_dirty:
+                await save_security_settings(security_settings)
+                logger.debug("Flushed security settings")
         except asyncio.CancelledError:
             break
         except Exception as e:
-            logger.error(f"Error in auto-save: {e}")
+            logger.error("Error flushing pending saves: %s", e)
+
+def flush_pending_saves_sync():
+    """Synchronously write any unsaved warnings/settings (shutdown path)."""
+    global warnings_dirty, security_dirty
+    if warnings_dirty:
+        warnings_dirty = False
+        save_warnings_sync(warnings_data)
+    if security_dirty:
+        security_dirty = False
+        save_json_sync(security_file, security_settings)
+
+# Last chance to persist debounced changes when the interpreter exits
+atexit.register(flush_pending_saves_sync)
 
 @bot.event
 async def on_ready():
     global last_heartbeat, is_ready, warnings_data
-    last_heartbeat = datetime.now(timezone.utc)
+    last_heartbeat = _now()
     is_ready = True
 
-    logger.info(f'Bot connected to Discord as {bot.user} (ID: {bot.user.id})')
-    logger.info(f'Bot is active in {len(bot.guilds)} guilds')
-    logger.info(f'Bot Status: {"🟢 ENABLED" if botEnabled else "🔴 DISABLED"} - Use Swork to enable')
-    logger.info(f'Main Owner ID: {MAIN_OWNER_ID}')
+    logger.info("Bot connected to Discord as %s (ID: %s)", bot.user, bot.user.id)
+    logger.info("Bot is active in %s guilds", len(bot.guilds))
+    logger.info("Bot Status: %s - Use Swork to enable", '🟢 ENABLED' if botEnabled else '🔴 DISABLED')
+    logger.info("Main Owner ID: %s", MAIN_OWNER_ID)
     
-    # Reload warnings data on reconnect to ensure we have latest
-    warnings_data = load_warnings()
-    logger.info(f'Loaded warnings data: {sum(len(guild_data) for guild_data in warnings_data.values())} user warnings from {len(warnings_data)} guilds')
+    # Reload warnings data on reconnect to ensure we have latest, unless
+    # there are changes the flusher has not written yet
+    if not warnings_dirty:
+        warnings_data = load_warnings()
+    logger.info("Loaded warnings data: %s user warnings from %s guilds", sum(len(guild_data) for guild_data in warnings_data.values()), len(warnings_data))
     
     command_logger.info('Bot initialization completed successfully')
 
@@ -526,26 +991,47 @@ async def on_ready():
     print(f'Bot is in {len(bot.guilds)} guilds')
 
     # Start health monitoring
-    bot.loop.create_task(check_heartbeat())
+    start_background_task('heartbeat', check_heartbeat)
     
-    # Start auto-save task
-    bot.loop.create_task(auto_save_warnings())
+    # Start the debounced save task
+    start_background_task('flush_pending_saves', flush_pending_saves)
+
+    # Start tracker cleanup task
+    start_background_task('prune_trackers', prune_trackers_task)
+    start_background_task('sweep_action_tracker', sweep_action_tracker)
+
+    # Build anti-spam exemption sets from whitelisted roles
+    rebuild_all_spam_exempt()
+
+    # Development mode: register everything on one guild, where it applies
+    # instantly, and leave the global command set alone
+    if DEV_GUILD_ID:
+        try:
+            dev_guild = discord.Object(id=DEV_GUILD_ID)
+            bot.tree.copy_global_to(guild=dev_guild)
+            await bot.tree.sync(guild=dev_guild)
+            logger.info("Synced commands to development guild %s", DEV_GUILD_ID)
+            print(f'Synced commands to development guild {DEV_GUILD_ID}')
+        except Exception as e:
+            logger.error("Failed to sync commands to development guild %s: %s", DEV_GUILD_ID, e)
+            print(f'Failed to sync commands: {e}')
+        return
 
     # Sync commands with guilds
     try:
         for guild in bot.guilds:
             try:
                 await bot.tree.sync(guild=guild)
-                logger.info(f'Synced commands for guild: {guild.name} (ID: {guild.id})')
+                logger.info("Synced commands for guild: %s (ID: %s)", guild.name, guild.id)
                 print(f'Synced commands for guild: {guild.name}')
             except Exception as e:
-                logger.error(f'Failed to sync commands for guild {guild.name} (ID: {guild.id}): {e}')
+                logger.error("Failed to sync commands for guild %s (ID: %s): %s", guild.name, guild.id, e)
                 print(f'Failed to sync commands for guild {guild.name}: {e}')
         await bot.tree.sync()  # Global sync
         logger.info('Synced commands globally')
         print('Synced commands globally')
     except Exception as e:
-        logger.error(f'Failed to sync commands globally: {e}')
+        logger.error("Failed to sync commands globally: %s", e)
         print(f'Failed to sync commands: {e}')
 
 @bot.event
@@ -553,18 +1039,22 @@ async def on_disconnect():
     """Save all data when bot disconnects."""
     logger.info("Bot disconnecting, saving all data...")
     try:
-        await save_warnings(warnings_data)
+        if warnings_dirty:
+            await save_warnings(warnings_data)
+        if security_dirty:
+            await save_security_settings(security_settings)
         logger.info("All data saved successfully")
     except Exception as e:
-        logger.error(f"Error saving data on disconnect: {e}")
+        logger.error("Error saving data on disconnect: %s", e)
 
 @bot.event
 async def on_resume():
     """Handle bot reconnection."""
     logger.info("Bot reconnected, reloading data...")
     global warnings_data
-    warnings_data = load_warnings()
-    logger.info(f'Reloaded warnings data after reconnection')
+    if not warnings_dirty:
+        warnings_data = load_warnings()
+        logger.info("Reloaded warnings data after reconnection")
 
 @bot.event
 async def on_message(message):
@@ -574,35 +1064,40 @@ async def on_message(message):
         return
 
     # Anti-spam check
-    if message.guild and security_settings.get('antispam_enabled', True):
-        if isinstance(message.author, discord.Member) and not is_whitelisted(message.author):
+    sc = _SEC
+    if message.guild and sc.antispam_enabled:
+        if isinstance(message.author, discord.Member) and not is_spam_exempt(message.author):
             guild_id = message.guild.id
             user_id = message.author.id
             
             if guild_id not in spam_tracker:
                 spam_tracker[guild_id] = {}
             if user_id not in spam_tracker[guild_id]:
-                spam_tracker[guild_id][user_id] = {'messages': [], 'last_message': 0}
+                spam_tracker[guild_id][user_id] = new_spam_entry()
             
-            current_time = time.time()
-            time_window = security_settings.get('antispam_time_window', 5)
-            message_limit = security_settings.get('antispam_message_limit', 5)
-            mention_limit = security_settings.get('antispam_mention_limit', 5)
-            duplicate_limit = security_settings.get('antispam_duplicate_limit', 3)
+            current_time = _now()
+            time_window = sc.time_window
+            message_limit = sc.message_limit
+            mention_limit = sc.mention_limit
+            duplicate_limit = sc.duplicate_limit
             
             user_data = spam_tracker[guild_id][user_id]
             
-            # Check message rate
-            recent_messages = [
-                (content, timestamp) for content, timestamp in user_data['messages']
-                if current_time - timestamp < time_window
-            ]
+            # Drop messages outside the time window (oldest are on the left)
+            recent_messages = user_data['messages']
+            content_hashes = user_data['hashes']
+            while recent_messages and current_time - recent_messages[0][1] >= time_window:
+                old_hash = recent_messages.popleft()[0]
+                content_hashes[old_hash] -= 1
+                if not content_hashes[old_hash]:
+                    del content_hashes[old_hash]
             
             # Check mentions
             mention_count = len(message.mentions) + len(message.role_mentions)
             
             # Check duplicates
-            duplicate_count = sum(1 for content, _ in recent_messages if content == message.content)
+            content_hash = hash(message.content)
+            duplicate_count = content_hashes[content_hash]
             
             # Check for spam
             is_spam = False
@@ -621,7 +1116,7 @@ async def on_message(message):
                 spam_reason.append(f"{duplicate_count} duplicate messages")
             
             if is_spam:
-                action = security_settings.get('antispam_action', 'mute')
+                action = sc.action
                 reason = f"Anti-spam: {', '.join(spam_reason)}"
                 
                 try:
@@ -630,39 +1125,45 @@ async def on_message(message):
                     elif action == 'kick':
                         await message.author.kick(reason=reason)
                     elif action == 'mute':
-                        mute_duration = security_settings.get('antispam_mute_duration', 10)
+                        mute_duration = sc.mute_duration
                         until = discord.utils.utcnow() + timedelta(minutes=mute_duration)
                         await message.author.timeout(until, reason=reason)
                     
                     # Delete spam messages
-                    try:
-                        await message.delete()
-                    except:
-                        pass
+                    await delete_spam_messages(message, recent_messages)
                     
-                    logger.warning(f"ANTI-SPAM: {action.upper()} applied to {message.author} (ID: {message.author.id}) in guild {message.guild.id}: {reason}")
+                    logger.warning("ANTI-SPAM: %s applied to %s (ID: %s) in guild %s: %s", action.upper(), message.author, message.author.id, message.guild.id, reason)
                 except Exception as e:
-                    logger.error(f"Failed to apply anti-spam action: {e}")
+                    logger.error("Failed to apply anti-spam action: %s", e)
                 
-                # Clear spam tracker for this user
-                spam_tracker[guild_id][user_id] = {'messages': [], 'last_message': 0}
+                # Clear spam tracker for this user; prune_trackers may have
+                # dropped the guild's dict while the actions above were awaited
+                spam_tracker.setdefault(guild_id, {})[user_id] = new_spam_entry()
                 return  # Don't process the spam message
             
             # Track message
-            user_data['messages'].append((message.content, current_time))
+            recent_messages.append((content_hash, current_time, message.id, message.channel.id))
+            content_hashes[content_hash] += 1
             user_data['last_message'] = current_time
-            
-            # Clean old messages
-            user_data['messages'] = [
-                (content, timestamp) for content, timestamp in user_data['messages']
-                if current_time - timestamp < time_window * 2
-            ]
 
-    logger.debug(f"Message received from {message.author} (ID: {message.author.id}) in guild {message.guild.name if message.guild else 'DM'}: {message.content}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Message received from %s (ID: %s) in guild %s: %s",
+                     message.author, message.author.id, message.guild.name if message.guild else 'DM', message.content)
 
     # Process commands
     await bot.process_commands(message)
 
+# (name, bit) for every permission flag; VALID_FLAGS values are already masks
+_PERM_FLAG_BITS = tuple(discord.Permissions.VALID_FLAGS.items())
+
+def perm_names(perms: discord.Permissions) -> PermissionList:
+    """Names of the permissions set in `perms`."""
+    value = perms.value
+    return [name for name, bit in _PERM_FLAG_BITS if value & bit]
+
+# Errors raised by before_command after it has already replied
+_SILENT_ERRORS = frozenset({'OwnerOnly', 'BotDisabled', 'Cooldown'})
+
 @bot.event
 async def on_command_error(ctx: commands.Context, error: Exception) -> None:
     """
@@ -681,85 +1182,74 @@ async def on_command_error(ctx: commands.Context, error: Exception) -> None:
         'channel_id': channel_id,
         'command_name': ctx.command.name if ctx.command else 'Unknown'
     }
-
-    # Helper to safely send messages
-    async def safe_send(content):
-        try:
-            if ctx.interaction:
-                if not ctx.interaction.response.is_done():
-                    await ctx.interaction.response.send_message(content, ephemeral=True)
-                else:
-                    await ctx.interaction.followup.send(content, ephemeral=True)
-            else:
-                await ctx.send(content)
-        except Exception as e:
-            logger.error(f"Error sending message in on_command_error: {e}")
     
     # Handle custom errors from before_invoke
     if isinstance(error, commands.CommandError):
-        error_msg = str(error)
-        if error_msg in ['OwnerOnly', 'BotDisabled', 'Cooldown']:
+        if str(error) in _SILENT_ERRORS:
             # Already handled in before_invoke, just return
             return
+
+    # Commands using the shared handler have already responded
+    if ctx.command is not None and getattr(ctx.command, 'on_error', None) is handle_command_error:
+        return
     
     if isinstance(error, commands.CommandNotFound):
         user_id = ctx.author.id
-        current_time = time.time()
+        current_time = _now()
 
         # Track unknown commands
-        if user_id not in unknown_command_tracker:
-            unknown_command_tracker[user_id] = {'count': 0, 'last_time': 0}
+        tracked = touch_unknown_command(user_id)
 
         # Reset count if more than 5 minutes have passed since last unknown command
-        if current_time - unknown_command_tracker[user_id]['last_time'] > 300:  # 5 minutes
-            unknown_command_tracker[user_id]['count'] = 0
+        if current_time - tracked['last_time'] > 300:  # 5 minutes
+            tracked['count'] = 0
 
-        unknown_command_tracker[user_id]['count'] += 1
-        unknown_command_tracker[user_id]['last_time'] = current_time
+        tracked['count'] += 1
+        tracked['last_time'] = current_time
 
         # Check if user has exceeded threshold
-        if unknown_command_tracker[user_id]['count'] >= 3:
+        if tracked['count'] >= 3:
             # Apply punishment: mute for 10 minutes
             if ctx.guild:
                 try:
                     until = discord.utils.utcnow() + timedelta(minutes=10)
                     await ctx.author.timeout(until, reason="Spamming unknown commands")
-                    await safe_send(f'🚫 {ctx.author.mention} has been muted for 10 minutes due to spamming unknown commands.')
-                    logger.warning(f"User {ctx.author} (ID: {user_id}) muted for spamming unknown commands in guild {guild_id}")
+                    await safe_send(ctx, f'🚫 {ctx.author.mention} has been muted for 10 minutes due to spamming unknown commands.', ephemeral=True)
+                    logger.warning("User %s (ID: %s) muted for spamming unknown commands in guild %s", ctx.author, user_id, guild_id)
                     # Reset count after punishment
-                    unknown_command_tracker[user_id]['count'] = 0
+                    tracked['count'] = 0
                 except Exception as e:
-                    logger.error(f"Failed to mute user {user_id} for unknown command spam: {e}")
-                    await safe_send('❌ Unknown command. Use `/help` to see available commands.')
+                    logger.error("Failed to mute user %s for unknown command spam: %s", user_id, e)
+                    await safe_send(ctx, '❌ Unknown command. Use `/help` to see available commands.', ephemeral=True)
             else:
-                await safe_send('❌ Unknown command. Use `/help` to see available commands.')
+                await safe_send(ctx, '❌ Unknown command. Use `/help` to see available commands.', ephemeral=True)
         else:
             # Silent for first 2 attempts to avoid spam, just log it
             # Only send message if it's the 2nd attempt (warning before mute)
-            if unknown_command_tracker[user_id]['count'] == 2:
-                await safe_send('❌ Unknown command. Use `/help` to see available commands.')
+            if tracked['count'] == 2:
+                await safe_send(ctx, '❌ Unknown command. Use `/help` to see available commands.', ephemeral=True)
             
-        logger.info(f"Command not found in guild {guild_id} - Count: {unknown_command_tracker[user_id]['count']}")
+        logger.info("Command not found in guild %s - Count: %s", guild_id, tracked['count'])
         
     elif isinstance(error, commands.MissingPermissions):
-        await safe_send('❌ You need Administrator permission to use this command.')
-        logger.warning(f"Missing permissions in guild {guild_id} for command {ctx.command.name}")
+        await safe_send(ctx, '❌ You need Administrator permission to use this command.', ephemeral=True)
+        logger.warning("Missing permissions in guild %s for command %s", guild_id, ctx.command.name)
         
     elif isinstance(error, commands.BotMissingPermissions):
         missing = [perm.replace('_', ' ').title() for perm in error.missing_permissions]
-        await safe_send(f'❌ I need the following permissions: {", ".join(missing)}')
-        logger.error(f"Bot missing permissions in guild {guild_id}: {missing}")
+        await safe_send(ctx, f'❌ I need the following permissions: {", ".join(missing)}', ephemeral=True)
+        logger.error("Bot missing permissions in guild %s: %s", guild_id, missing)
         
     elif isinstance(error, commands.MissingRequiredArgument):
-        await safe_send(f'❌ Missing required argument: {error.param.name}. Check `/help` for usage.')
-        logger.info(f"Missing argument in guild {guild_id}: {error.param.name}")
+        await safe_send(ctx, f'❌ Missing required argument: {error.param.name}. Check `/help` for usage.', ephemeral=True)
+        logger.info("Missing argument in guild %s: %s", guild_id, error.param.name)
         
     elif isinstance(error, commands.BadArgument):
-        await safe_send('❌ Invalid argument provided. Please check `/help` for correct usage.')
-        logger.warning(f"Bad argument in guild {guild_id} for command {ctx.command.name}")
+        await safe_send(ctx, '❌ Invalid argument provided. Please check `/help` for correct usage.', ephemeral=True)
+        logger.warning("Bad argument in guild %s for command %s", guild_id, ctx.command.name)
         
     else:
-        await safe_send('❌ An unexpected error occurred. Please try again later.')
+        await safe_send(ctx, '❌ An unexpected error occurred. Please try again later.', ephemeral=True)
         logger.error(
             "Uncaught error in command execution",
             extra={
@@ -772,17 +1262,85 @@ async def on_command_error(ctx: commands.Context, error: Exception) -> None:
     
     # Log bot permissions only if there's a permission-related error
     if isinstance(error, (commands.MissingPermissions, commands.BotMissingPermissions)):
-        if ctx.guild:
+        if ctx.guild and logger.isEnabledFor(logging.DEBUG):
             logger.debug(
                 "Bot permission details",
                 extra={
                     'guild_id': guild_id,
-                    'bot_permissions': [p[0] for p in ctx.guild.me.guild_permissions if p[1]],
+                    'bot_permissions': perm_names(ctx.guild.me.guild_permissions),
                     'bot_top_role_position': ctx.guild.me.top_role.position
                 }
             )
 
-@bot.hybrid_command(name='addrole', description='Add a role to a member', default_member_permissions=discord.Permissions(administrator=True))
+# Failure codes returned by check_hierarchy
+HIERARCHY_AUTHOR = 'author'
+HIERARCHY_BOT = 'bot'
+
+def check_hierarchy(actor: discord.Member, bot_member: discord.Member, target_role: discord.Role, guild: discord.Guild) -> Optional[str]:
+    """Check that both the invoker and the bot sit above `target_role`.
+
+    Returns HIERARCHY_AUTHOR or HIERARCHY_BOT for the first check that fails,
+    or None. The guild owner bypasses the invoker check. Each top_role is
+    resolved at most once.
+    """
+    if actor.id != guild.owner_id and target_role >= actor.top_role:
+        return HIERARCHY_AUTHOR
+    if target_role >= bot_member.top_role:
+        return HIERARCHY_BOT
+    return None
+
+# Shared error handling for moderation commands: one handler per error type,
+# resolved along the exception's MRO so converter subclasses such as
+# MemberNotFound fall through to their BadArgument handler
+def _guild_ref(ctx) -> Union[int, str]:
+    return ctx.guild.id if ctx.guild else 'N/A'
+
+async def _send_need_admin(ctx, error):
+    permission_logger.warning("%s: Missing permissions for user %s in guild %s", ctx.command.name, ctx.author.id, _guild_ref(ctx))
+    await ctx.send('❌ You need Administrator permission to use this command.')
+
+async def _send_missing_arg(ctx, error):
+    error_logger.warning("%s: Missing required argument for user %s in guild %s", ctx.command.name, ctx.author.id, _guild_ref(ctx))
+    await ctx.send(f'❌ Missing required argument. Usage: `/{ctx.command.name} {ctx.command.usage or ""}`')
+
+async def _send_bad_member(ctx, error):
+    error_logger.warning("%s: Bad argument provided by user %s in guild %s", ctx.command.name, ctx.author.id, _guild_ref(ctx))
+    await ctx.send('❌ Invalid member specified. Please mention a valid member.')
+
+async def _send_bad_arg(ctx, error):
+    error_logger.warning("%s: Bad argument provided by user %s in guild %s", ctx.command.name, ctx.author.id, _guild_ref(ctx))
+    await ctx.send(f'❌ Invalid argument provided. Usage: `/{ctx.command.name} {ctx.command.usage or ""}`')
+
+async def _send_bot_missing(ctx, error):
+    permission_logger.error("%s: Bot missing permissions in guild %s", ctx.command.name, _guild_ref(ctx))
+    missing = [perm.replace('_', ' ').title() for perm in error.missing_permissions]
+    await ctx.send(f'❌ I need the following permissions: {", ".join(missing)}')
+
+async def _send_unexpected(ctx, error):
+    error_logger.error("%s: Unhandled error in guild %s: %s: %s", ctx.command.name, _guild_ref(ctx), type(error).__name__, error, exc_info=error)
+    await ctx.send('❌ An unexpected error occurred. Please try again later.')
+
+ERROR_HANDLERS = {
+    commands.MissingPermissions: _send_need_admin,
+    commands.MissingRequiredArgument: _send_missing_arg,
+    commands.MemberNotFound: _send_bad_member,
+    commands.BadArgument: _send_bad_arg,
+    commands.BotMissingPermissions: _send_bot_missing,
+}
+
+async def handle_command_error(ctx, error):
+    """Error handler shared by the moderation commands; replies using the command's usage string."""
+    # Custom errors from before_invoke have already been reported
+    if str(error) in _SILENT_ERRORS:
+        return
+    for cls in type(error).__mro__:
+        handler = ERROR_HANDLERS.get(cls)
+        if handler is not None:
+            await handler(ctx, error)
+            return
+    await _send_unexpected(ctx, error)
+
+@bot.hybrid_command(name='addrole', description='Add a role to a member', default_member_permissions=_ADMIN_PERMS)
 async def addrole(ctx: commands.Context, member: discord.Member, role: discord.Role) -> None:
     """
     Add a role to a member with comprehensive permission checks and error handling.
@@ -799,135 +1357,150 @@ async def addrole(ctx: commands.Context, member: discord.Member, role: discord.R
     """
     try:
         # Log command execution start
-        command_logger.info(f"addrole: Started - Target: {member} (ID: {member.id}), Role: {role.name} (ID: {role.id}), Guild: {ctx.guild.name} (ID: {ctx.guild.id})")
+        command_logger.info("addrole: Started - Target: %s (ID: %s), Role: %s (ID: %s), Guild: %s (ID: %s)", member, member.id, role.name, role.id, ctx.guild.name, ctx.guild.id)
+
+        # guild_permissions is recomputed from the member's roles on every
+        # access, so resolve it once per invocation
+        author_perms = ctx.author.guild_permissions
+        bot_perms = ctx.guild.me.guild_permissions
 
         # Check if user has administrator permission
-        if not ctx.author.guild_permissions.administrator:
-            permission_logger.warning(f"addrole: Permission denied - User {ctx.author} (ID: {ctx.author.id}) lacks Administrator permission in guild {ctx.guild.id}")
+        if not author_perms.administrator:
+            permission_logger.warning("addrole: Permission denied - User %s (ID: %s) lacks Administrator permission in guild %s", ctx.author, ctx.author.id, ctx.guild.id)
             await ctx.send("❌ You don't have permission to use this command. Required: Administrator permission.")
             return
 
         # Validate bot permissions
-        if not ctx.guild.me.guild_permissions.manage_roles:
-            permission_logger.error(f"addrole: Bot missing manage_roles permission in guild {ctx.guild.id}")
+        if not bot_perms.manage_roles:
+            permission_logger.error("addrole: Bot missing manage_roles permission in guild %s", ctx.guild.id)
             await ctx.send('❌ I need the "Manage Roles" permission to execute this command.')
             return
 
-        # Check role hierarchy for user
-        if role >= ctx.author.top_role and ctx.author != ctx.guild.owner:
-            permission_logger.warning(f"addrole: Hierarchy violation - User {ctx.author.id} cannot assign role {role.id} (higher/equal to user's role) in guild {ctx.guild.id}")
+        # Check role hierarchy for user, then for bot
+        hierarchy = check_hierarchy(ctx.author, ctx.guild.me, role, ctx.guild)
+        if hierarchy == HIERARCHY_AUTHOR:
+            permission_logger.warning("addrole: Hierarchy violation - User %s cannot assign role %s (higher/equal to user's role) in guild %s", ctx.author.id, role.id, ctx.guild.id)
             await ctx.send('❌ You cannot add a role higher than or equal to your highest role.')
             return
 
-        # Check role hierarchy for bot
-        if role >= ctx.guild.me.top_role:
-            permission_logger.error(f"addrole: Bot hierarchy insufficient - Cannot assign role {role.id} (higher/equal to bot's role) in guild {ctx.guild.id}")
+        if hierarchy == HIERARCHY_BOT:
+            permission_logger.error("addrole: Bot hierarchy insufficient - Cannot assign role %s (higher/equal to bot's role) in guild %s", role.id, ctx.guild.id)
             await ctx.send('❌ I cannot assign a role higher than or equal to my highest role.')
             return
 
-        # Check for existing role
-        if role in member.roles:
-            command_logger.info(f"addrole: Role {role.id} already exists on member {member.id} in guild {ctx.guild.id}")
+        # Check for existing role (binary search over the sorted role IDs)
+        if member._roles.has(role.id):
+            command_logger.info("addrole: Role %s already exists on member %s in guild %s", role.id, member.id, ctx.guild.id)
             await ctx.send(f'❌ {member.mention} already has the {role.mention} role.')
             return
 
         # Add role with timeout handling
         try:
-            async with asyncio.timeout(10):  # 10 second timeout
-                await member.add_roles(role, reason=f"Added by {ctx.author} (ID: {ctx.author.id})")
-                await ctx.send(f'✅ Successfully added {role.mention} to {member.mention}!')
-                command_logger.info(f"addrole: SUCCESS - Role {role.name} (ID: {role.id}) added to member {member.name} (ID: {member.id}) in guild {ctx.guild.name} (ID: {ctx.guild.id}) by {ctx.author.name} (ID: {ctx.author.id})")
+            await asyncio.wait_for(
+                member.add_roles(role, reason=f"Added by {ctx.author} (ID: {ctx.author.id})"),
+                timeout=10  # 10 second timeout
+            )
+            await ctx.send(f'✅ Successfully added {role.mention} to {member.mention}!')
+            command_logger.info("addrole: SUCCESS - Role %s (ID: %s) added to member %s (ID: %s) in guild %s (ID: %s) by %s (ID: %s)", role.name, role.id, member.name, member.id, ctx.guild.name, ctx.guild.id, ctx.author.name, ctx.author.id)
         except asyncio.TimeoutError:
-            error_logger.error(f"addrole: TIMEOUT - Operation timed out for role {role.id} to member {member.id} in guild {ctx.guild.id}")
+            error_logger.error("addrole: TIMEOUT - Operation timed out for role %s to member %s in guild %s", role.id, member.id, ctx.guild.id)
             await ctx.send('❌ The operation timed out. Please try again.')
             return
 
     except discord.Forbidden as e:
-        error_logger.error(f"addrole: FORBIDDEN - Permission denied adding role {role.id} to member {member.id} in guild {ctx.guild.id}: {str(e)}")
+        error_logger.error("addrole: FORBIDDEN - Permission denied adding role %s to member %s in guild %s: %s", role.id, member.id, ctx.guild.id, e)
         error_msg = '❌ I don\'t have permission to add roles. Make sure my role is above the role you\'re trying to add.'
         await ctx.send(error_msg)
 
     except discord.HTTPException as e:
-        error_logger.error(f"addrole: HTTP_ERROR - Discord error {e.status} when adding role {role.id} to member {member.id} in guild {ctx.guild.id}: {e.text}")
+        error_logger.error("addrole: HTTP_ERROR - Discord error %s when adding role %s to member %s in guild %s: %s", e.status, role.id, member.id, ctx.guild.id, e.text)
         error_msg = f'❌ Failed to add role due to Discord error: {e.status} - {e.text}'
         await ctx.send(error_msg)
 
     except Exception as e:
-        error_logger.error(f"addrole: UNEXPECTED_ERROR - Unexpected error when adding role {role.id} to member {member.id} in guild {ctx.guild.id}: {str(e)}", exc_info=True)
+        error_logger.error("addrole: UNEXPECTED_ERROR - Unexpected error when adding role %s to member %s in guild %s: %s", role.id, member.id, ctx.guild.id, e, exc_info=True)
         await ctx.send('❌ An unexpected error occurred. Please try again later.')
 
 @bot.hybrid_command(name='removerole', description='Remove a role from a member', default_member_permissions=discord.Permissions(manage_guild=True))
 async def removerole(ctx, member: discord.Member, role: discord.Role):
     try:
         # Log command execution start
-        command_logger.info(f"removerole: Started - Target: {member} (ID: {member.id}), Role: {role.name} (ID: {role.id}), Guild: {ctx.guild.name} (ID: {ctx.guild.id})")
+        command_logger.info("removerole: Started - Target: %s (ID: %s), Role: %s (ID: %s), Guild: %s (ID: %s)", member, member.id, role.name, role.id, ctx.guild.name, ctx.guild.id)
 
         # Only allow members with the configured manager role
         if not is_manager_member(ctx.author):
-            permission_logger.warning(f"removerole: Permission denied - User {ctx.author} (ID: {ctx.author.id}) lacks Manager role in guild {ctx.guild.id}")
+            permission_logger.warning("removerole: Permission denied - User %s (ID: %s) lacks Manager role in guild %s", ctx.author, ctx.author.id, ctx.guild.id)
             await ctx.send("❌ You don't have permission to use this command. Required: Manager role.")
             return
 
         # Check if bot has manage roles permission
         if not ctx.guild.me.guild_permissions.manage_roles:
-            permission_logger.error(f"removerole: Bot missing manage_roles permission in guild {ctx.guild.id}")
+            permission_logger.error("removerole: Bot missing manage_roles permission in guild %s", ctx.guild.id)
             await ctx.send('❌ I need the "Manage Roles" permission to execute this command.')
             return
 
-        if role not in member.roles:
-            command_logger.info(f"removerole: Role {role.id} not found on member {member.id} in guild {ctx.guild.id}")
+        if not member._roles.has(role.id):
+            command_logger.info("removerole: Role %s not found on member %s in guild %s", role.id, member.id, ctx.guild.id)
             await ctx.send(f'❌ {member.mention} doesn\'t have the {role.mention} role.')
             return
 
-        if role >= ctx.author.top_role and ctx.author != ctx.guild.owner:
-            permission_logger.warning(f"removerole: Hierarchy violation - User {ctx.author.id} cannot remove role {role.id} (higher/equal to user's role) in guild {ctx.guild.id}")
+        hierarchy = check_hierarchy(ctx.author, ctx.guild.me, role, ctx.guild)
+        if hierarchy == HIERARCHY_AUTHOR:
+            permission_logger.warning("removerole: Hierarchy violation - User %s cannot remove role %s (higher/equal to user's role) in guild %s", ctx.author.id, role.id, ctx.guild.id)
             await ctx.send('❌ You cannot remove a role higher than or equal to your highest role.')
             return
 
-        if role >= ctx.guild.me.top_role:
-            permission_logger.error(f"removerole: Bot hierarchy insufficient - Cannot remove role {role.id} (higher/equal to bot's role) in guild {ctx.guild.id}")
+        if hierarchy == HIERARCHY_BOT:
+            permission_logger.error("removerole: Bot hierarchy insufficient - Cannot remove role %s (higher/equal to bot's role) in guild %s", role.id, ctx.guild.id)
             await ctx.send('❌ I cannot remove a role higher than or equal to my highest role.')
             return
 
         await member.remove_roles(role, reason=f"Removed by {ctx.author} (ID: {ctx.author.id})")
         await ctx.send(f'✅ Successfully removed {role.mention} from {member.mention}!')
-        command_logger.info(f"removerole: SUCCESS - Role {role.name} (ID: {role.id}) removed from member {member.name} (ID: {member.id}) in guild {ctx.guild.name} (ID: {ctx.guild.id}) by {ctx.author.name} (ID: {ctx.author.id})")
+        command_logger.info("removerole: SUCCESS - Role %s (ID: %s) removed from member %s (ID: %s) in guild %s (ID: %s) by %s (ID: %s)", role.name, role.id, member.name, member.id, ctx.guild.name, ctx.guild.id, ctx.author.name, ctx.author.id)
 
     except discord.Forbidden as e:
-        error_logger.error(f"removerole: FORBIDDEN - Permission denied removing role {role.id} from member {member.id} in guild {ctx.guild.id}: {str(e)}")
+        error_logger.error("removerole: FORBIDDEN - Permission denied removing role %s from member %s in guild %s: %s", role.id, member.id, ctx.guild.id, e)
         await ctx.send('❌ I don\'t have permission to remove roles. Make sure my role is above the role you\'re trying to remove.')
     except discord.HTTPException as e:
-        error_logger.error(f"removerole: HTTP_ERROR - Discord error when removing role {role.id} from member {member.id} in guild {ctx.guild.id}: {str(e)}")
+        error_logger.error("removerole: HTTP_ERROR - Discord error when removing role %s from member %s in guild %s: %s", role.id, member.id, ctx.guild.id, e)
         await ctx.send(f'❌ Failed to remove role. Error: {str(e)}')
     except Exception as e:
-        error_logger.error(f"removerole: UNEXPECTED_ERROR - Unexpected error when removing role {role.id} from member {member.id} in guild {ctx.guild.id}: {str(e)}", exc_info=True)
+        error_logger.error("removerole: UNEXPECTED_ERROR - Unexpected error when removing role %s from member %s in guild %s: %s", role.id, member.id, ctx.guild.id, e, exc_info=True)
         await ctx.send(f'❌ An unexpected error occurred: {str(e)}')
 
 class RoleListView(discord.ui.View):
-    def __init__(self, roles, guild_name, timeout=300):
+    def __init__(self, roles, guild_name, counts, timeout=300):
         super().__init__(timeout=timeout)
         self.roles = roles
         self.guild_name = guild_name
         self.page = 0
         self.per_page = 25
 
-    def get_embed(self):
-        start = self.page * self.per_page
+        # Render every line once; `counts` maps role ID -> member count
+        self._lines = [f'{role.mention} - {counts[role.id]} members' for role in roles]
+
+        # Pages never change while the view is alive, so build them all up front
+        self._total_pages = (len(roles) - 1) // self.per_page + 1
+        self._embeds = [self._build_embed(page) for page in range(self._total_pages)]
+
+    def _build_embed(self, page):
+        start = page * self.per_page
         end = start + self.per_page
-        role_list = self.roles[start:end]
-        description = '\n'.join([f'{role.mention} - {len(role.members)} members' for role in role_list])
+        description = '\n'.join(self._lines[start:end])
 
         embed = discord.Embed(
             title=f'Roles in {self.guild_name}',
             description=description,
-            color=discord.Color.blue()
+            color=_COLOR_BLUE
         )
-
-        total_pages = (len(self.roles) - 1) // self.per_page + 1
-        embed.set_footer(text=f'Page {self.page + 1} of {total_pages} ({len(self.roles)} total roles)')
+        embed.set_footer(text=f'Page {page + 1} of {self._total_pages} ({len(self.roles)} total roles)')
 
         return embed
 
+    def get_embed(self):
+        return self._embeds[self.page]
+
     @discord.ui.button(label='Previous', style=discord.ButtonStyle.primary)
     async def previous_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         if self.page > 0:
@@ -939,8 +1512,7 @@ class RoleListView(discord.ui.View):
 
     @discord.ui.button(label='Next', style=discord.ButtonStyle.primary)
     async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        total_pages = (len(self.roles) - 1) // self.per_page + 1
-        if self.page < total_pages - 1:
+        if self.page < self._total_pages - 1:
             self.page += 1
             embed = self.get_embed()
             await interaction.response.edit_message(embed=embed, view=self)
@@ -948,68 +1520,88 @@ class RoleListView(discord.ui.View):
             await interaction.response.defer()
 
 @bot.hybrid_command(name='listroles', description='List all roles in the server')
+@require_defer
 async def listroles(ctx):
     # Check if command is used in a guild
     if ctx.guild is None:
         await ctx.send('❌ This command can only be used in a server.')
         return
     
-    command_logger.info(f"listroles: Started - Guild: {ctx.guild.name} (ID: {ctx.guild.id}) by {ctx.author.name} (ID: {ctx.author.id})")
+    command_logger.info("listroles: Started - Guild: %s (ID: %s) by %s (ID: %s)", ctx.guild.name, ctx.guild.id, ctx.author.name, ctx.author.id)
 
     roles = [role for role in ctx.guild.roles if role.name != '@everyone']
     roles.reverse()
 
     if not roles:
-        command_logger.info(f"listroles: No roles found in guild {ctx.guild.id}")
+        command_logger.info("listroles: No roles found in guild %s", ctx.guild.id)
         await ctx.send('❌ No roles found in this server.')
         return
 
-    view = RoleListView(roles, ctx.guild.name)
+    # role.members walks every guild member per role, so count all roles in
+    # a single pass over the member list instead
+    await ensure_chunked(ctx.guild)
+    counts = Counter()
+    for m in ctx.guild.members:
+        counts.update(m._roles)
+
+    view = RoleListView(roles, ctx.guild.name, counts)
     embed = view.get_embed()
 
     await ctx.send(embed=embed, view=view)
-    command_logger.info(f"listroles: SUCCESS - Listed {len(roles)} roles in guild {ctx.guild.name} (ID: {ctx.guild.id})")
+    command_logger.info("listroles: SUCCESS - Listed %s roles in guild %s (ID: %s)", len(roles), ctx.guild.name, ctx.guild.id)
+
 
+ROLEALL_CONCURRENCY = 15  # Concurrent add_roles requests per roleall run
+ROLEALL_PROGRESS_INTERVAL = 2.0  # Minimum seconds between progress edits
 
-@bot.hybrid_command(name='roleall', description='Add a role to all server members', default_member_permissions=discord.Permissions(administrator=True))
+@bot.hybrid_command(name='roleall', description='Add a role to all server members', default_member_permissions=_ADMIN_PERMS)
 @commands.has_permissions(administrator=True)
+@require_defer
 async def roleall(ctx, role: discord.Role, confirm: bool = False):
     """Assign `role` to every non-bot member in the guild.
 
     Safety: by default the command will do a dry-run and report how many members would be affected.
     To actually run it, call with `confirm=True`.
     """
-    command_logger.info(f"roleall: Started - Role: {role.name} (ID: {role.id}), Confirm: {confirm}, Guild: {ctx.guild.name} (ID: {ctx.guild.id}) by {ctx.author.name} (ID: {ctx.author.id})")
+    command_logger.info("roleall: Started - Role: %s (ID: %s), Confirm: %s, Guild: %s (ID: %s) by %s (ID: %s)", role.name, role.id, confirm, ctx.guild.name, ctx.guild.id, ctx.author.name, ctx.author.id)
 
     # Check if user has manage roles permission
     if not ctx.author.guild_permissions.manage_roles:
-        permission_logger.warning(f"roleall: Permission denied - User {ctx.author.id} lacks manage_roles permission in guild {ctx.guild.id}")
+        permission_logger.warning("roleall: Permission denied - User %s lacks manage_roles permission in guild %s", ctx.author.id, ctx.guild.id)
         await ctx.send("❌ You don't have permission to use this command. Required: Manage Roles permission.")
         return
 
     # Check role hierarchy
-    if role >= ctx.author.top_role and ctx.author != ctx.guild.owner:
-        permission_logger.warning(f"roleall: Hierarchy violation - User {ctx.author.id} cannot assign role {role.id} (higher/equal to user's role) in guild {ctx.guild.id}")
+    hierarchy = check_hierarchy(ctx.author, ctx.guild.me, role, ctx.guild)
+    if hierarchy == HIERARCHY_AUTHOR:
+        permission_logger.warning("roleall: Hierarchy violation - User %s cannot assign role %s (higher/equal to user's role) in guild %s", ctx.author.id, role.id, ctx.guild.id)
         await ctx.send('❌ You cannot assign a role higher than or equal to your highest role.')
         return
 
-    if role >= ctx.guild.me.top_role:
-        permission_logger.error(f"roleall: Bot hierarchy insufficient - Cannot assign role {role.id} (higher/equal to bot's role) in guild {ctx.guild.id}")
+    if hierarchy == HIERARCHY_BOT:
+        permission_logger.error("roleall: Bot hierarchy insufficient - Cannot assign role %s (higher/equal to bot's role) in guild %s", role.id, ctx.guild.id)
         await ctx.send('❌ I cannot assign a role higher than or equal to my highest role.')
         return
 
-    # Get list of non-bot members who don't have the role
-    members_to_add = [m for m in ctx.guild.members if not m.bot and role not in m.roles]
+    # Non-bot members who don't have the role; a dry run only needs the count
+    await ensure_chunked(ctx.guild)
+    role_id = role.id
+    needs_role = (m for m in ctx.guild.members if not m.bot and not m._roles.has(role_id))
+    if confirm:
+        members_to_add = list(needs_role)
+        affected = len(members_to_add)
+    else:
+        affected = sum(1 for _ in needs_role)
 
-    if not members_to_add:
-        command_logger.info(f"roleall: All non-bot members already have role {role.id} in guild {ctx.guild.id}")
+    if not affected:
+        command_logger.info("roleall: All non-bot members already have role %s in guild %s", role.id, ctx.guild.id)
         await ctx.send('✅ All non-bot members already have this role.')
         return
 
     # If not confirming, just show how many members would be affected
     if not confirm:
-        command_logger.info(f"roleall: DRY_RUN - Would add role {role.id} to {len(members_to_add)} members in guild {ctx.guild.id}")
-        await ctx.send(f'ℹ️ This would add {role.mention} to {len(members_to_add)} members.\n'
+        command_logger.info("roleall: DRY_RUN - Would add role %s to %s members in guild %s", role.id, affected, ctx.guild.id)
+        await ctx.send(f'ℹ️ This would add {role.mention} to {affected} members.\n'
                       'Run the command again with `confirm=True` to execute.')
         return
 
@@ -1017,275 +1609,245 @@ async def roleall(ctx, role: discord.Role, confirm: bool = False):
     success_count = 0
     failed_count = 0
 
-    command_logger.info(f"roleall: EXECUTION_START - Adding role {role.id} to {len(members_to_add)} members in guild {ctx.guild.id}")
+    command_logger.info("roleall: EXECUTION_START - Adding role %s to %s members in guild %s", role.id, len(members_to_add), ctx.guild.id)
     progress_msg = await ctx.send(f'🔄 Adding {role.mention} to {len(members_to_add)} members...')
 
-    try:
-        for member in members_to_add:
+    # Overlap the per-member requests, capped so a single roleall stays
+    # well inside Discord's per-route bucket
+    sem = asyncio.Semaphore(ROLEALL_CONCURRENCY)
+
+    async def _add(member):
+        async with sem:
             try:
                 await member.add_roles(role)
-                success_count += 1
+                return True
             except Exception as e:
+                error_logger.warning("roleall: Failed to add role %s to member %s in guild %s: %s", role.id, member.id, ctx.guild.id, e)
+                return False
+
+    total = len(members_to_add)
+    last_edit = 0.0
+
+    try:
+        for fut in asyncio.as_completed([_add(m) for m in members_to_add]):
+            if await fut:
+                success_count += 1
+            else:
                 failed_count += 1
-                error_logger.warning(f"roleall: Failed to add role {role.id} to member {member.id} in guild {ctx.guild.id}: {str(e)}")
 
-            # Update progress every 10 members
-            if (success_count + failed_count) % 10 == 0:
-                await progress_msg.edit(content=f'🔄 Progress: {success_count + failed_count}/{len(members_to_add)}')
+            # Coalesce progress edits; they share rate limits with the role adds
+            done = success_count + failed_count
+            now = _now()
+            if now - last_edit >= ROLEALL_PROGRESS_INTERVAL or done == total:
+                last_edit = now
+                try:
+                    await progress_msg.edit(content=f'🔄 Progress: {done}/{total}')
+                except discord.HTTPException as e:
+                    error_logger.warning("roleall: Failed to update progress message in guild %s: %s", ctx.guild.id, e)
 
     except Exception as e:
-        error_logger.error(f"roleall: Unexpected error during bulk role assignment in guild {ctx.guild.id}: {str(e)}", exc_info=True)
+        error_logger.error("roleall: Unexpected error during bulk role assignment in guild %s: %s", ctx.guild.id, e, exc_info=True)
         await ctx.send(f'❌ An error occurred: {str(e)}')
         return
 
-    command_logger.info(f"roleall: SUCCESS - Added role {role.name} (ID: {role.id}) to {success_count} members, failed for {failed_count} members in guild {ctx.guild.name} (ID: {ctx.guild.id})")
+    command_logger.info("roleall: SUCCESS - Added role %s (ID: %s) to %s members, failed for %s members in guild %s (ID: %s)", role.name, role.id, success_count, failed_count, ctx.guild.name, ctx.guild.id)
     await ctx.send(f'✅ Operation complete!\n'
                    f'Successfully added role to {success_count} members.\n'
                    f'Failed for {failed_count} members.')
 
-@bot.hybrid_command(name='kick', description='Kick a member', default_member_permissions=discord.Permissions(administrator=True))
+# Static parts of the kick/ban/mute confirmations, filled per call via Embed.from_dict
+_KICKED_EMBED = {'title': 'Member Kicked', 'color': _COLOR_ORANGE.value}
+_BANNED_EMBED = {'title': 'Member Banned', 'color': _COLOR_RED.value}
+_MUTED_EMBED = {'title': 'Member Muted', 'color': _COLOR_GRAY.value}
+
+def moderation_embed(template: dict, description: str, reason: str, moderator: str) -> discord.Embed:
+    """Build a moderation confirmation embed from one of the templates above."""
+    data = dict(template)
+    data['description'] = description
+    data['fields'] = [
+        {'name': 'Reason', 'value': reason, 'inline': False},
+        {'name': 'Moderator', 'value': moderator, 'inline': False},
+    ]
+    return discord.Embed.from_dict(data)
+
+@bot.hybrid_command(name='kick', description='Kick a member', usage='<member> [reason]', default_member_permissions=_ADMIN_PERMS)
 @commands.has_permissions(administrator=True)
 async def kick(ctx, member: discord.Member, *, reason: str = 'No reason provided'):
-    command_logger.info(f"kick: Started - Target: {member} (ID: {member.id}), Reason: '{reason}', Guild: {ctx.guild.name} (ID: {ctx.guild.id}) by {ctx.author.name} (ID: {ctx.author.id})")
+    command_logger.info("kick: Started - Target: %s (ID: %s), Reason: '%s', Guild: %s (ID: %s) by %s (ID: %s)", member, member.id, reason, ctx.guild.name, ctx.guild.id, ctx.author.name, ctx.author.id)
 
     if member == ctx.author:
-        command_logger.warning(f"kick: Self-kick attempt blocked for user {ctx.author.id} in guild {ctx.guild.id}")
+        command_logger.warning("kick: Self-kick attempt blocked for user %s in guild %s", ctx.author.id, ctx.guild.id)
         await ctx.send('❌ You cannot kick yourself.')
         return
 
-    if member.top_role >= ctx.author.top_role and ctx.author != ctx.guild.owner:
-        permission_logger.warning(f"kick: Hierarchy violation - User {ctx.author.id} cannot kick member {member.id} (higher/equal role) in guild {ctx.guild.id}")
+    hierarchy = check_hierarchy(ctx.author, ctx.guild.me, member.top_role, ctx.guild)
+    if hierarchy == HIERARCHY_AUTHOR:
+        permission_logger.warning("kick: Hierarchy violation - User %s cannot kick member %s (higher/equal role) in guild %s", ctx.author.id, member.id, ctx.guild.id)
         await ctx.send('❌ You cannot kick a member with a role higher than or equal to yours.')
         return
 
-    if member.top_role >= ctx.guild.me.top_role:
-        permission_logger.error(f"kick: Bot hierarchy insufficient - Cannot kick member {member.id} (higher/equal to bot's role) in guild {ctx.guild.id}")
+    if hierarchy == HIERARCHY_BOT:
+        permission_logger.error("kick: Bot hierarchy insufficient - Cannot kick member %s (higher/equal to bot's role) in guild %s", member.id, ctx.guild.id)
         await ctx.send('❌ I cannot kick a member with a role higher than or equal to mine.')
         return
 
     try:
         await member.kick(reason=f'{reason} | Kicked by {ctx.author}')
-        embed = discord.Embed(
-            title='Member Kicked',
-            description=f'{member.mention} has been kicked.',
-            color=discord.Color.orange()
-        )
-        embed.add_field(name='Reason', value=reason, inline=False)
-        embed.add_field(name='Moderator', value=ctx.author.mention, inline=False)
+        embed = moderation_embed(_KICKED_EMBED, f'{member.mention} has been kicked.', reason, ctx.author.mention)
         await ctx.send(embed=embed)
-        command_logger.info(f"kick: SUCCESS - Member {member.name} (ID: {member.id}) kicked from guild {ctx.guild.name} (ID: {ctx.guild.id}) by {ctx.author.name} (ID: {ctx.author.id}) for reason: {reason}")
+        command_logger.info("kick: SUCCESS - Member %s (ID: %s) kicked from guild %s (ID: %s) by %s (ID: %s) for reason: %s", member.name, member.id, ctx.guild.name, ctx.guild.id, ctx.author.name, ctx.author.id, reason)
     except discord.Forbidden:
-        error_logger.error(f"kick: FORBIDDEN - Permission denied kicking member {member.id} in guild {ctx.guild.id}")
+        error_logger.error("kick: FORBIDDEN - Permission denied kicking member %s in guild %s", member.id, ctx.guild.id)
         await ctx.send('❌ I don\'t have permission to kick members.')
     except Exception as e:
-        error_logger.error(f"kick: UNEXPECTED_ERROR - Error kicking member {member.id} in guild {ctx.guild.id}: {str(e)}", exc_info=True)
+        error_logger.error("kick: UNEXPECTED_ERROR - Error kicking member %s in guild %s: %s", member.id, ctx.guild.id, e, exc_info=True)
         await ctx.send(f'❌ An error occurred: {str(e)}')
 
-@kick.error
-async def kick_error(ctx, error):
-    if isinstance(error, commands.MissingPermissions):
-        permission_logger.warning(f"kick_error: Missing permissions for user {ctx.author.id} in guild {ctx.guild.id if ctx.guild else 'N/A'}")
-        await ctx.send('❌ You need Administrator permission to use this command.')
-    elif isinstance(error, commands.MissingRequiredArgument):
-        error_logger.warning(f"kick_error: Missing required argument for user {ctx.author.id} in guild {ctx.guild.id if ctx.guild else 'N/A'}")
-        await ctx.send('❌ Missing required argument. Usage: `/kick <member> [reason]`')
-    elif isinstance(error, commands.BadArgument):
-        error_logger.warning(f"kick_error: Bad argument provided by user {ctx.author.id} in guild {ctx.guild.id if ctx.guild else 'N/A'}")
-        await ctx.send('❌ Invalid member specified. Please mention a valid member.')
-    elif isinstance(error, commands.BotMissingPermissions):
-        permission_logger.error(f"kick_error: Bot missing permissions in guild {ctx.guild.id if ctx.guild else 'N/A'}")
-        await ctx.send('❌ I don\'t have permission to kick members. Please check my role permissions.')
-    else:
-        error_logger.error(f"kick_error: Unhandled error in guild {ctx.guild.id if ctx.guild else 'N/A'}: {type(error).__name__}: {str(error)}", exc_info=True)
+kick.error(handle_command_error)
 
-@bot.hybrid_command(name='ban', description='Ban a member from the server', default_member_permissions=discord.Permissions(administrator=True))
+@bot.hybrid_command(name='ban', description='Ban a member from the server', usage='<member> [reason]', default_member_permissions=_ADMIN_PERMS)
 @commands.has_permissions(administrator=True)
 async def ban(ctx, member: discord.Member, *, reason: str = 'No reason provided'):
-    command_logger.info(f"ban: Started - Target: {member} (ID: {member.id}), Reason: '{reason}', Guild: {ctx.guild.name} (ID: {ctx.guild.id}) by {ctx.author.name} (ID: {ctx.author.id})")
+    command_logger.info("ban: Started - Target: %s (ID: %s), Reason: '%s', Guild: %s (ID: %s) by %s (ID: %s)", member, member.id, reason, ctx.guild.name, ctx.guild.id, ctx.author.name, ctx.author.id)
 
     if member == ctx.author:
-        command_logger.warning(f"ban: Self-ban attempt blocked for user {ctx.author.id} in guild {ctx.guild.id}")
+        command_logger.warning("ban: Self-ban attempt blocked for user %s in guild %s", ctx.author.id, ctx.guild.id)
         await ctx.send('❌ You cannot ban yourself.')
         return
 
-    if member.top_role >= ctx.author.top_role and ctx.author != ctx.guild.owner:
-        permission_logger.warning(f"ban: Hierarchy violation - User {ctx.author.id} cannot ban member {member.id} (higher/equal role) in guild {ctx.guild.id}")
+    hierarchy = check_hierarchy(ctx.author, ctx.guild.me, member.top_role, ctx.guild)
+    if hierarchy == HIERARCHY_AUTHOR:
+        permission_logger.warning("ban: Hierarchy violation - User %s cannot ban member %s (higher/equal role) in guild %s", ctx.author.id, member.id, ctx.guild.id)
         await ctx.send('❌ You cannot ban a member with a role higher than or equal to yours.')
         return
 
-    if member.top_role >= ctx.guild.me.top_role:
-        permission_logger.error(f"ban: Bot hierarchy insufficient - Cannot ban member {member.id} (higher/equal to bot's role) in guild {ctx.guild.id}")
+    if hierarchy == HIERARCHY_BOT:
+        permission_logger.error("ban: Bot hierarchy insufficient - Cannot ban member %s (higher/equal to bot's role) in guild %s", member.id, ctx.guild.id)
         await ctx.send('❌ I cannot ban a member with a role higher than or equal to mine.')
         return
 
     try:
         await member.ban(reason=f'{reason} | Banned by {ctx.author}')
-        embed = discord.Embed(
-            title='Member Banned',
-            description=f'{member.mention} has been banned.',
-            color=discord.Color.red()
-        )
-        embed.add_field(name='Reason', value=reason, inline=False)
-        embed.add_field(name='Moderator', value=ctx.author.mention, inline=False)
+        embed = moderation_embed(_BANNED_EMBED, f'{member.mention} has been banned.', reason, ctx.author.mention)
         await ctx.send(embed=embed)
-        command_logger.info(f"ban: SUCCESS - Member {member.name} (ID: {member.id}) banned from guild {ctx.guild.name} (ID: {ctx.guild.id}) by {ctx.author.name} (ID: {ctx.author.id}) for reason: {reason}")
+        command_logger.info("ban: SUCCESS - Member %s (ID: %s) banned from guild %s (ID: %s) by %s (ID: %s) for reason: %s", member.name, member.id, ctx.guild.name, ctx.guild.id, ctx.author.name, ctx.author.id, reason)
     except discord.Forbidden:
-        error_logger.error(f"ban: FORBIDDEN - Permission denied banning member {member.id} in guild {ctx.guild.id}")
+        error_logger.error("ban: FORBIDDEN - Permission denied banning member %s in guild %s", member.id, ctx.guild.id)
         await ctx.send('❌ I don\'t have permission to ban members.')
     except Exception as e:
-        error_logger.error(f"ban: UNEXPECTED_ERROR - Error banning member {member.id} in guild {ctx.guild.id}: {str(e)}", exc_info=True)
+        error_logger.error("ban: UNEXPECTED_ERROR - Error banning member %s in guild %s: %s", member.id, ctx.guild.id, e, exc_info=True)
         await ctx.send(f'❌ An error occurred: {str(e)}')
 
-@ban.error
-async def ban_error(ctx, error):
-    if isinstance(error, commands.MissingPermissions):
-        permission_logger.warning(f"ban_error: Missing permissions for user {ctx.author.id} in guild {ctx.guild.id if ctx.guild else 'N/A'}")
-        await ctx.send('❌ You need Administrator permission to use this command.')
-    elif isinstance(error, commands.MissingRequiredArgument):
-        error_logger.warning(f"ban_error: Missing required argument for user {ctx.author.id} in guild {ctx.guild.id if ctx.guild else 'N/A'}")
-        await ctx.send('❌ Missing required argument. Usage: `/ban <member> [reason]`')
-    elif isinstance(error, commands.BadArgument):
-        error_logger.warning(f"ban_error: Bad argument provided by user {ctx.author.id} in guild {ctx.guild.id if ctx.guild else 'N/A'}")
-        await ctx.send('❌ Invalid member specified. Please mention a valid member.')
-    elif isinstance(error, commands.BotMissingPermissions):
-        permission_logger.error(f"ban_error: Bot missing permissions in guild {ctx.guild.id if ctx.guild else 'N/A'}")
-        await ctx.send('❌ I don\'t have permission to ban members. Please check my role permissions.')
-    else:
-        error_logger.error(f"ban_error: Unhandled error in guild {ctx.guild.id if ctx.guild else 'N/A'}: {type(error).__name__}: {str(error)}", exc_info=True)
+ban.error(handle_command_error)
 
-@bot.hybrid_command(name='unban', description='Unban a user from the server', default_member_permissions=discord.Permissions(administrator=True))
+@bot.hybrid_command(name='unban', description='Unban a user from the server', usage='<user_id>', default_member_permissions=_ADMIN_PERMS)
 @commands.has_permissions(administrator=True)
 async def unban(ctx, user_id: str):
-    command_logger.info(f"unban: Started - Target User ID: {user_id}, Guild: {ctx.guild.name} (ID: {ctx.guild.id}) by {ctx.author.name} (ID: {ctx.author.id})")
+    command_logger.info("unban: Started - Target User ID: %s, Guild: %s (ID: %s) by %s (ID: %s)", user_id, ctx.guild.name, ctx.guild.id, ctx.author.name, ctx.author.id)
 
     try:
         user_id_int = int(user_id)
-        user = await bot.fetch_user(user_id_int)
-        await ctx.guild.unban(user)
-        await ctx.send(f'✅ Successfully unbanned {user.mention}!')
-        command_logger.info(f"unban: SUCCESS - User {user.name} (ID: {user.id}) unbanned from guild {ctx.guild.name} (ID: {ctx.guild.id}) by {ctx.author.name} (ID: {ctx.author.id})")
+        # unban only needs the snowflake; skip the /users/{id} round-trip
+        await ctx.guild.unban(discord.Object(id=user_id_int), reason=f'Unbanned by {ctx.author}')
+        await ctx.send(f'✅ Successfully unbanned <@{user_id_int}>!')
+        cached = bot.get_user(user_id_int)
+        command_logger.info("unban: SUCCESS - User %s (ID: %s) unbanned from guild %s (ID: %s) by %s (ID: %s)", cached.name if cached else user_id_int, user_id_int, ctx.guild.name, ctx.guild.id, ctx.author.name, ctx.author.id)
     except ValueError:
-        error_logger.warning(f"unban: Invalid user ID '{user_id}' provided by user {ctx.author.id} in guild {ctx.guild.id}")
+        error_logger.warning("unban: Invalid user ID '%s' provided by user %s in guild %s", user_id, ctx.author.id, ctx.guild.id)
         await ctx.send('❌ Invalid user ID. Please provide a valid numeric user ID.')
     except discord.NotFound:
-        error_logger.warning(f"unban: User ID {user_id} not found or not banned in guild {ctx.guild.id}")
+        error_logger.warning("unban: User ID %s not found or not banned in guild %s", user_id, ctx.guild.id)
         await ctx.send('❌ User not found or not banned.')
     except discord.Forbidden:
-        error_logger.error(f"unban: FORBIDDEN - Permission denied unbanning user {user_id} in guild {ctx.guild.id}")
+        error_logger.error("unban: FORBIDDEN - Permission denied unbanning user %s in guild %s", user_id, ctx.guild.id)
         await ctx.send('❌ I don\'t have permission to unban members.')
     except Exception as e:
-        error_logger.error(f"unban: UNEXPECTED_ERROR - Error unbanning user {user_id} in guild {ctx.guild.id}: {str(e)}", exc_info=True)
+        error_logger.error("unban: UNEXPECTED_ERROR - Error unbanning user %s in guild %s: %s", user_id, ctx.guild.id, e, exc_info=True)
         await ctx.send(f'❌ An error occurred: {str(e)}')
 
-@unban.error
-async def unban_error(ctx, error):
-    if isinstance(error, commands.MissingPermissions):
-        permission_logger.warning(f"unban_error: Missing permissions for user {ctx.author.id} in guild {ctx.guild.id if ctx.guild else 'N/A'}")
-        await ctx.send('❌ You need Administrator permission to use this command.')
-    elif isinstance(error, commands.MissingRequiredArgument):
-        error_logger.warning(f"unban_error: Missing required argument for user {ctx.author.id} in guild {ctx.guild.id if ctx.guild else 'N/A'}")
-        await ctx.send('❌ Missing required argument. Usage: `/unban <user_id>`')
+unban.error(handle_command_error)
 
-@bot.hybrid_command(name='mute', description='Timeout a member', default_member_permissions=discord.Permissions(administrator=True))
+@bot.hybrid_command(name='mute', description='Timeout a member', usage='<member> [duration] [reason]', default_member_permissions=_ADMIN_PERMS)
 @commands.has_permissions(administrator=True)
 async def mute(ctx, member: discord.Member, duration: int = 10, *, reason: str = 'No reason provided'):
-    command_logger.info(f"mute: Started - Target: {member} (ID: {member.id}), Duration: {duration}min, Reason: '{reason}', Guild: {ctx.guild.name} (ID: {ctx.guild.id}) by {ctx.author.name} (ID: {ctx.author.id})")
+    command_logger.info("mute: Started - Target: %s (ID: %s), Duration: %smin, Reason: '%s', Guild: %s (ID: %s) by %s (ID: %s)", member, member.id, duration, reason, ctx.guild.name, ctx.guild.id, ctx.author.name, ctx.author.id)
 
     if member == ctx.author:
-        command_logger.warning(f"mute: Self-mute attempt blocked for user {ctx.author.id} in guild {ctx.guild.id}")
+        command_logger.warning("mute: Self-mute attempt blocked for user %s in guild %s", ctx.author.id, ctx.guild.id)
         await ctx.send('❌ You cannot mute yourself.')
         return
 
-    if member.top_role >= ctx.author.top_role and ctx.author != ctx.guild.owner:
-        permission_logger.warning(f"mute: Hierarchy violation - User {ctx.author.id} cannot mute member {member.id} (higher/equal role) in guild {ctx.guild.id}")
+    hierarchy = check_hierarchy(ctx.author, ctx.guild.me, member.top_role, ctx.guild)
+    if hierarchy == HIERARCHY_AUTHOR:
+        permission_logger.warning("mute: Hierarchy violation - User %s cannot mute member %s (higher/equal role) in guild %s", ctx.author.id, member.id, ctx.guild.id)
         await ctx.send('❌ You cannot mute a member with a role higher than or equal to yours.')
         return
 
-    if member.top_role >= ctx.guild.me.top_role:
-        permission_logger.error(f"mute: Bot hierarchy insufficient - Cannot mute member {member.id} (higher/equal to bot's role) in guild {ctx.guild.id}")
+    if hierarchy == HIERARCHY_BOT:
+        permission_logger.error("mute: Bot hierarchy insufficient - Cannot mute member %s (higher/equal to bot's role) in guild %s", member.id, ctx.guild.id)
         await ctx.send('❌ I cannot mute a member with a role higher than or equal to mine.')
         return
 
     try:
         until = discord.utils.utcnow() + timedelta(minutes=duration)
         await member.timeout(until, reason=f'{reason} | Muted by {ctx.author}')
-        embed = discord.Embed(
-            title='Member Muted',
-            description=f'{member.mention} has been muted for {duration} minutes.',
-            color=discord.Color.dark_gray()
-        )
-        embed.add_field(name='Reason', value=reason, inline=False)
-        embed.add_field(name='Moderator', value=ctx.author.mention, inline=False)
+        embed = moderation_embed(_MUTED_EMBED, f'{member.mention} has been muted for {duration} minutes.', reason, ctx.author.mention)
         await ctx.send(embed=embed)
-        command_logger.info(f"mute: SUCCESS - Member {member.name} (ID: {member.id}) muted for {duration} minutes in guild {ctx.guild.name} (ID: {ctx.guild.id}) by {ctx.author.name} (ID: {ctx.author.id}) for reason: {reason}")
+        command_logger.info("mute: SUCCESS - Member %s (ID: %s) muted for %s minutes in guild %s (ID: %s) by %s (ID: %s) for reason: %s", member.name, member.id, duration, ctx.guild.name, ctx.guild.id, ctx.author.name, ctx.author.id, reason)
     except discord.Forbidden:
-        error_logger.error(f"mute: FORBIDDEN - Permission denied muting member {member.id} in guild {ctx.guild.id}")
+        error_logger.error("mute: FORBIDDEN - Permission denied muting member %s in guild %s", member.id, ctx.guild.id)
         await ctx.send('❌ I don\'t have permission to timeout members.')
     except Exception as e:
-        error_logger.error(f"mute: UNEXPECTED_ERROR - Error muting member {member.id} in guild {ctx.guild.id}: {str(e)}", exc_info=True)
+        error_logger.error("mute: UNEXPECTED_ERROR - Error muting member %s in guild %s: %s", member.id, ctx.guild.id, e, exc_info=True)
         await ctx.send(f'❌ An error occurred: {str(e)}')
 
-@mute.error
-async def mute_error(ctx, error):
-    if isinstance(error, commands.MissingPermissions):
-        permission_logger.warning(f"mute_error: Missing permissions for user {ctx.author.id} in guild {ctx.guild.id if ctx.guild else 'N/A'}")
-        await ctx.send('❌ You need Administrator permission to use this command.')
-    elif isinstance(error, commands.MissingRequiredArgument):
-        error_logger.warning(f"mute_error: Missing required argument for user {ctx.author.id} in guild {ctx.guild.id if ctx.guild else 'N/A'}")
-        await ctx.send('❌ Missing required argument. Usage: `/mute <member> [duration] [reason]`')
+mute.error(handle_command_error)
 
-@bot.hybrid_command(name='unmute', description='Remove timeout from a member', default_member_permissions=discord.Permissions(administrator=True))
+@bot.hybrid_command(name='unmute', description='Remove timeout from a member', usage='<member>', default_member_permissions=_ADMIN_PERMS)
 @commands.has_permissions(administrator=True)
 async def unmute(ctx, member: discord.Member):
-    command_logger.info(f"unmute: Started - Target: {member} (ID: {member.id}), Guild: {ctx.guild.name} (ID: {ctx.guild.id}) by {ctx.author.name} (ID: {ctx.author.id})")
+    command_logger.info("unmute: Started - Target: %s (ID: %s), Guild: %s (ID: %s) by %s (ID: %s)", member, member.id, ctx.guild.name, ctx.guild.id, ctx.author.name, ctx.author.id)
 
     try:
         await member.timeout(None)
         await ctx.send(f'✅ Successfully unmuted {member.mention}!')
-        command_logger.info(f"unmute: SUCCESS - Member {member.name} (ID: {member.id}) unmuted in guild {ctx.guild.name} (ID: {ctx.guild.id}) by {ctx.author.name} (ID: {ctx.author.id})")
+        command_logger.info("unmute: SUCCESS - Member %s (ID: %s) unmuted in guild %s (ID: %s) by %s (ID: %s)", member.name, member.id, ctx.guild.name, ctx.guild.id, ctx.author.name, ctx.author.id)
     except discord.Forbidden:
-        error_logger.error(f"unmute: FORBIDDEN - Permission denied unmuting member {member.id} in guild {ctx.guild.id}")
+        error_logger.error("unmute: FORBIDDEN - Permission denied unmuting member %s in guild %s", member.id, ctx.guild.id)
         await ctx.send('❌ I don\'t have permission to remove timeouts.')
     except Exception as e:
-        error_logger.error(f"unmute: UNEXPECTED_ERROR - Error unmuting member {member.id} in guild {ctx.guild.id}: {str(e)}", exc_info=True)
+        error_logger.error("unmute: UNEXPECTED_ERROR - Error unmuting member %s in guild %s: %s", member.id, ctx.guild.id, e, exc_info=True)
         await ctx.send(f'❌ An error occurred: {str(e)}')
 
-@unmute.error
-async def unmute_error(ctx, error):
-    if isinstance(error, commands.MissingPermissions):
-        permission_logger.warning(f"unmute_error: Missing permissions for user {ctx.author.id} in guild {ctx.guild.id if ctx.guild else 'N/A'}")
-        await ctx.send('❌ You need Administrator permission to use this command.')
-    elif isinstance(error, commands.MissingRequiredArgument):
-        error_logger.warning(f"unmute_error: Missing required argument for user {ctx.author.id} in guild {ctx.guild.id if ctx.guild else 'N/A'}")
-        await ctx.send('❌ Missing required argument. Usage: `/unmute <member>`')
+unmute.error(handle_command_error)
 
-@bot.hybrid_command(name='warn', description='Warn a member with automatic punishment escalation', default_member_permissions=discord.Permissions(administrator=True))
+@bot.hybrid_command(name='warn', description='Warn a member with automatic punishment escalation', usage='<member> [reason]', default_member_permissions=_ADMIN_PERMS)
 @commands.has_permissions(administrator=True)
+@require_defer
 async def warn(ctx, member: discord.Member, *, reason: str = 'No reason provided'):
-    command_logger.info(f"warn: Started - Target: {member} (ID: {member.id}), Reason: '{reason}', Guild: {ctx.guild.name} (ID: {ctx.guild.id}) by {ctx.author.name} (ID: {ctx.author.id})")
+    command_logger.info("warn: Started - Target: %s (ID: %s), Reason: '%s', Guild: %s (ID: %s) by %s (ID: %s)", member, member.id, reason, ctx.guild.name, ctx.guild.id, ctx.author.name, ctx.author.id)
 
     if member == ctx.author:
-        command_logger.warning(f"warn: Self-warn attempt blocked for user {ctx.author.id} in guild {ctx.guild.id}")
+        command_logger.warning("warn: Self-warn attempt blocked for user %s in guild %s", ctx.author.id, ctx.guild.id)
         await ctx.send('❌ You cannot warn yourself.')
         return
 
-    # Initialize warnings for guild and user if not exists
-    guild_id = str(ctx.guild.id)
-    user_id = str(member.id)
-    if guild_id not in warnings_data:
-        warnings_data[guild_id] = {}
-    if user_id not in warnings_data[guild_id]:
-        warnings_data[guild_id][user_id] = 0
+    # Increment warning count (missing guild/user entries start at 0)
+    guild_warnings = warnings_data[ctx.guild.id]
+    guild_warnings[member.id] += 1
+    warning_count = guild_warnings[member.id]
+    mark_warnings_dirty()
 
-    # Increment warning count
-    warnings_data[guild_id][user_id] += 1
-    warning_count = warnings_data[guild_id][user_id]
-    await save_warnings(warnings_data)
+    # Start the DM now so its round trip overlaps building the reply; it is
+    # awaited before any automatic kick/ban so the member can still receive it
+    dm_task = asyncio.create_task(
+        member.send(f'⚠️ You have been warned in {ctx.guild.name}.\n**Reason:** {reason}\n**Warning Count:** {warning_count}')
+    )
 
     embed = discord.Embed(
         title='Member Warned',
         description=f'{member.mention} has been warned.',
-        color=discord.Color.yellow()
+        color=_COLOR_YELLOW
     )
     embed.add_field(name='Reason', value=reason, inline=False)
     embed.add_field(name='Warning Count', value=f'{warning_count}', inline=True)
@@ -1293,13 +1855,13 @@ async def warn(ctx, member: discord.Member, *, reason: str = 'No reason provided
 
     dm_sent = True
     try:
-        await member.send(f'⚠️ You have been warned in {ctx.guild.name}.\n**Reason:** {reason}\n**Warning Count:** {warning_count}')
-    except:
+        await dm_task
+    except Exception:
         embed.set_footer(text='Could not DM user')
         dm_sent = False
 
     await ctx.send(embed=embed)
-    command_logger.info(f"warn: SUCCESS - Member {member.name} (ID: {member.id}) warned in guild {ctx.guild.name} (ID: {ctx.guild.id}) by {ctx.author.name} (ID: {ctx.author.id}) for reason: {reason}, DM sent: {dm_sent}, Count: {warning_count}")
+    command_logger.info("warn: SUCCESS - Member %s (ID: %s) warned in guild %s (ID: %s) by %s (ID: %s) for reason: %s, DM sent: %s, Count: %s", member.name, member.id, ctx.guild.name, ctx.guild.id, ctx.author.name, ctx.author.id, reason, dm_sent, warning_count)
 
     # Apply automatic punishments based on warning count
     if warning_count == 3:
@@ -1311,37 +1873,32 @@ async def warn(ctx, member: discord.Member, *, reason: str = 'No reason provided
     elif warning_count > 6:
         await apply_ban(ctx, member, f"{warning_count} warnings reached | Original reason: {reason}")
 
-@warn.error
-async def warn_error(ctx, error):
-    if isinstance(error, commands.MissingPermissions):
-        permission_logger.warning(f"warn_error: Missing permissions for user {ctx.author.id} in guild {ctx.guild.id if ctx.guild else 'N/A'}")
-        await ctx.send('❌ You need Administrator permission to use this command.')
-    elif isinstance(error, commands.MissingRequiredArgument):
-        error_logger.warning(f"warn_error: Missing required argument for user {ctx.author.id} in guild {ctx.guild.id if ctx.guild else 'N/A'}")
-        await ctx.send('❌ Missing required argument. Usage: `/warn <member> [reason]`')
+warn.error(handle_command_error)
 
-@bot.hybrid_command(name='clearwarns', description='Clear warnings from a member', default_member_permissions=discord.Permissions(administrator=True))
+@bot.hybrid_command(name='clearwarns', description='Clear warnings from a member', usage='<member> [amount|all]', default_member_permissions=_ADMIN_PERMS)
 @commands.has_permissions(administrator=True)
+@require_defer
 async def clearwarns(ctx, member: discord.Member, amount: str = 'all'):
-    command_logger.info(f"clearwarns: Started - Target: {member} (ID: {member.id}), Amount: '{amount}', Guild: {ctx.guild.name} (ID: {ctx.guild.id}) by {ctx.author.name} (ID: {ctx.author.id})")
+    command_logger.info("clearwarns: Started - Target: %s (ID: %s), Amount: '%s', Guild: %s (ID: %s) by %s (ID: %s)", member, member.id, amount, ctx.guild.name, ctx.guild.id, ctx.author.name, ctx.author.id)
 
     if member == ctx.author:
-        command_logger.warning(f"clearwarns: Self-clear attempt blocked for user {ctx.author.id} in guild {ctx.guild.id}")
+        command_logger.warning("clearwarns: Self-clear attempt blocked for user %s in guild %s", ctx.author.id, ctx.guild.id)
         await ctx.send('❌ You cannot clear your own warnings.')
         return
 
-    guild_id = str(ctx.guild.id)
-    user_id = str(member.id)
+    user_id = member.id
+    # .get so looking up a clean member does not create entries
+    guild_warnings = warnings_data.get(ctx.guild.id)
 
-    if guild_id not in warnings_data or user_id not in warnings_data[guild_id]:
+    if not guild_warnings or user_id not in guild_warnings:
         await ctx.send(f'ℹ️ {member.mention} has no warnings in this server.')
         return
 
-    current_warnings = warnings_data[guild_id][user_id]
+    current_warnings = guild_warnings[user_id]
 
-    if amount.lower() == 'all':
+    if _lc(amount) == 'all':
         warnings_cleared = current_warnings
-        warnings_data[guild_id][user_id] = 0
+        guild_warnings[user_id] = 0
     else:
         try:
             warnings_to_clear = int(amount)
@@ -1349,77 +1906,76 @@ async def clearwarns(ctx, member: discord.Member, amount: str = 'all'):
                 await ctx.send('❌ Amount must be a positive number or "all".')
                 return
             warnings_cleared = min(warnings_to_clear, current_warnings)
-            warnings_data[guild_id][user_id] = max(0, current_warnings - warnings_to_clear)
+            guild_warnings[user_id] = max(0, current_warnings - warnings_to_clear)
         except ValueError:
             await ctx.send('❌ Amount must be a number or "all".')
             return
 
-    await save_warnings(warnings_data)
+    mark_warnings_dirty()
 
     embed = discord.Embed(
         title='Warnings Cleared',
         description=f'Warnings cleared for {member.mention}.',
-        color=discord.Color.green()
+        color=_COLOR_GREEN
     )
     embed.add_field(name='Warnings Cleared', value=str(warnings_cleared), inline=True)
-    embed.add_field(name='Remaining Warnings', value=str(warnings_data[guild_id][user_id]), inline=True)
+    embed.add_field(name='Remaining Warnings', value=str(guild_warnings[user_id]), inline=True)
     embed.add_field(name='Moderator', value=ctx.author.mention, inline=False)
 
     await ctx.send(embed=embed)
-    command_logger.info(f"clearwarns: SUCCESS - Cleared {warnings_cleared} warnings from {member.name} (ID: {member.id}) in guild {ctx.guild.name} (ID: {ctx.guild.id}) by {ctx.author.name} (ID: {ctx.author.id}), Remaining: {warnings_data[guild_id][user_id]}")
+    command_logger.info("clearwarns: SUCCESS - Cleared %s warnings from %s (ID: %s) in guild %s (ID: %s) by %s (ID: %s), Remaining: %s", warnings_cleared, member.name, member.id, ctx.guild.name, ctx.guild.id, ctx.author.name, ctx.author.id, guild_warnings[user_id])
 
-@clearwarns.error
-async def clearwarns_error(ctx, error):
-    if isinstance(error, commands.MissingPermissions):
-        permission_logger.warning(f"clearwarns_error: Missing permissions for user {ctx.author.id} in guild {ctx.guild.id if ctx.guild else 'N/A'}")
-        await ctx.send('❌ You need Administrator permission to use this command.')
-    elif isinstance(error, commands.MissingRequiredArgument):
-        error_logger.warning(f"clearwarns_error: Missing required argument for user {ctx.author.id} in guild {ctx.guild.id if ctx.guild else 'N/A'}")
-        await ctx.send('❌ Missing required argument. Usage: `/clearwarns <member> [amount]` (amount can be a number or "all")')
+clearwarns.error(handle_command_error)
 
-@bot.hybrid_command(name='purge', description='Delete multiple messages', default_member_permissions=discord.Permissions(administrator=True))
+@bot.hybrid_command(name='purge', description='Delete multiple messages', usage='<amount>', default_member_permissions=_ADMIN_PERMS)
 @commands.has_permissions(administrator=True)
+@require_defer(ephemeral=True)  # A visible "thinking" message would sit among the purged ones
 async def purge(ctx, amount: int):
-    command_logger.info(f"purge: Started - Amount: {amount}, Channel: {ctx.channel.name} (ID: {ctx.channel.id}), Guild: {ctx.guild.name} (ID: {ctx.guild.id}) by {ctx.author.name} (ID: {ctx.author.id})")
+    command_logger.info("purge: Started - Amount: %s, Channel: %s (ID: %s), Guild: %s (ID: %s) by %s (ID: %s)", amount, ctx.channel.name, ctx.channel.id, ctx.guild.name, ctx.guild.id, ctx.author.name, ctx.author.id)
 
     if amount < 1:
-        command_logger.warning(f"purge: Invalid amount {amount} provided by user {ctx.author.id} in guild {ctx.guild.id}")
+        command_logger.warning("purge: Invalid amount %s provided by user %s in guild %s", amount, ctx.author.id, ctx.guild.id)
         await ctx.send('❌ Please specify a number greater than 0.')
         return
 
     if amount > 100:
-        command_logger.warning(f"purge: Amount {amount} exceeds limit for user {ctx.author.id} in guild {ctx.guild.id}")
+        command_logger.warning("purge: Amount %s exceeds limit for user %s in guild %s", amount, ctx.author.id, ctx.guild.id)
         await ctx.send('❌ You can only delete up to 100 messages at a time.')
         return
 
     try:
-        deleted = await ctx.channel.purge(limit=amount + 1)
-        actual_deleted = len(deleted) - 1  # Subtract the confirmation message
-        msg = await ctx.send(f'✅ Successfully deleted {actual_deleted} messages.')
-        await msg.delete(delay=5)
-        command_logger.info(f"purge: SUCCESS - Deleted {actual_deleted} messages in channel {ctx.channel.name} (ID: {ctx.channel.id}) of guild {ctx.guild.name} (ID: {ctx.guild.id}) by {ctx.author.name} (ID: {ctx.author.id})")
+        # A prefix invocation is removed in the same bulk-delete request as the
+        # purged messages while that still fits in one batch of 100. Slash
+        # invocations have no message of their own.
+        limit, before = amount, ctx.message
+        if ctx.interaction is None and amount < 100:
+            # Snowflakes are time-ordered, so id + 1 sits just after the invocation
+            limit, before = amount + 1, discord.Object(id=ctx.message.id + 1)
+        deleted = await ctx.channel.purge(limit=limit, before=before, bulk=True)
+        actual_deleted = sum(1 for m in deleted if m.id != ctx.message.id)
+        # Slash replies are ephemeral; prefix replies stay, with no scheduled delete
+        await ctx.send(f'✅ Successfully deleted {actual_deleted} messages.', ephemeral=True)
+        command_logger.info("purge: SUCCESS - Deleted %s messages in channel %s (ID: %s) of guild %s (ID: %s) by %s (ID: %s)", actual_deleted, ctx.channel.name, ctx.channel.id, ctx.guild.name, ctx.guild.id, ctx.author.name, ctx.author.id)
     except discord.Forbidden:
-        error_logger.error(f"purge: FORBIDDEN - Permission denied deleting messages in channel {ctx.channel.id} of guild {ctx.guild.id}")
+        error_logger.error("purge: FORBIDDEN - Permission denied deleting messages in channel %s of guild %s", ctx.channel.id, ctx.guild.id)
         await ctx.send('❌ I don\'t have permission to delete messages. Please check my role permissions.')
     except discord.HTTPException as e:
         if e.code == 50034:
-            error_logger.warning(f"purge: OLD_MESSAGES - Cannot delete messages older than 14 days in channel {ctx.channel.id} of guild {ctx.guild.id}")
+            error_logger.warning("purge: OLD_MESSAGES - Cannot delete messages older than 14 days in channel %s of guild %s", ctx.channel.id, ctx.guild.id)
             await ctx.send('❌ Cannot delete messages older than 14 days.')
         else:
-            error_logger.error(f"purge: HTTP_ERROR - Discord error {e.status} when deleting messages in channel {ctx.channel.id} of guild {ctx.guild.id}: {e.text}")
+            error_logger.error("purge: HTTP_ERROR - Discord error %s when deleting messages in channel %s of guild %s: %s", e.status, ctx.channel.id, ctx.guild.id, e.text)
             await ctx.send(f'❌ Failed to delete messages: {str(e)}')
     except Exception as e:
-        error_logger.error(f"purge: UNEXPECTED_ERROR - Unexpected error when deleting messages in channel {ctx.channel.id} of guild {ctx.guild.id}: {str(e)}", exc_info=True)
+        error_logger.error("purge: UNEXPECTED_ERROR - Unexpected error when deleting messages in channel %s of guild %s: %s", ctx.channel.id, ctx.guild.id, e, exc_info=True)
         await ctx.send('❌ An unexpected error occurred while deleting messages.')
 
-@purge.error
-async def purge_error(ctx, error):
-    if isinstance(error, commands.MissingPermissions):
-        permission_logger.warning(f"purge_error: Missing permissions for user {ctx.author.id} in guild {ctx.guild.id if ctx.guild else 'N/A'}")
-        await ctx.send('❌ You need Administrator permission to use this command.')
-    elif isinstance(error, commands.MissingRequiredArgument):
-        error_logger.warning(f"purge_error: Missing required argument for user {ctx.author.id} in guild {ctx.guild.id if ctx.guild else 'N/A'}")
-        await ctx.send('❌ Missing required argument. Usage: `/purge <amount>`')
+purge.error(handle_command_error)
+
+@functools.lru_cache(maxsize=4096)
+def _fmt_date(ts: float) -> str:
+    """Format a UTC timestamp for info embeds; these dates never change, so cache them."""
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime('%B %d, %Y')
 
 @bot.hybrid_command(name='serverinfo', description='Display server information')
 async def serverinfo(ctx):
@@ -1428,13 +1984,13 @@ async def serverinfo(ctx):
         await ctx.send('❌ This command can only be used in a server.')
         return
     
-    command_logger.info(f"serverinfo: Requested for guild {ctx.guild.name} (ID: {ctx.guild.id}) by {ctx.author.name} (ID: {ctx.author.id})")
+    command_logger.info("serverinfo: Requested for guild %s (ID: %s) by %s (ID: %s)", ctx.guild.name, ctx.guild.id, ctx.author.name, ctx.author.id)
 
     guild = ctx.guild
 
     embed = discord.Embed(
         title=f'{guild.name} Server Information',
-        color=discord.Color.blue()
+        color=_COLOR_BLUE
     )
 
     if guild.icon:
@@ -1443,15 +1999,16 @@ async def serverinfo(ctx):
     owner_mention = guild.owner.mention if guild.owner else 'Unknown'
     embed.add_field(name='Owner', value=owner_mention, inline=True)
     embed.add_field(name='Server ID', value=guild.id, inline=True)
-    embed.add_field(name='Created', value=guild.created_at.strftime('%B %d, %Y'), inline=True)
+    embed.add_field(name='Created', value=_fmt_date(guild.created_at.timestamp()), inline=True)
     embed.add_field(name='Members', value=guild.member_count, inline=True)
     embed.add_field(name='Roles', value=len(guild.roles), inline=True)
     embed.add_field(name='Channels', value=len(guild.channels), inline=True)
 
     await ctx.send(embed=embed)
-    command_logger.info(f"serverinfo: SUCCESS - Displayed info for guild {ctx.guild.name} (ID: {ctx.guild.id}) with {guild.member_count} members, {len(guild.roles)} roles, {len(guild.channels)} channels")
+    command_logger.info("serverinfo: SUCCESS - Displayed info for guild %s (ID: %s) with %s members, %s roles, %s channels", ctx.guild.name, ctx.guild.id, guild.member_count, len(guild.roles), len(guild.channels))
 
 @bot.hybrid_command(name='userinfo', description='Display user information')
+@require_defer
 async def userinfo(ctx, member: Optional[discord.Member] = None):
     # Check if command is used in a guild (required for member info)
     if ctx.guild is None:
@@ -1461,7 +2018,7 @@ async def userinfo(ctx, member: Optional[discord.Member] = None):
     member = member or ctx.author
     target_is_self = member == ctx.author
 
-    command_logger.info(f"userinfo: Requested for {'self' if target_is_self else 'other user'} - Target: {member} (ID: {member.id}), Guild: {ctx.guild.name} (ID: {ctx.guild.id}) by {ctx.author.name} (ID: {ctx.author.id})")
+    command_logger.info("userinfo: Requested for %s - Target: %s (ID: %s), Guild: %s (ID: %s) by %s (ID: %s)", 'self' if target_is_self else 'other user', member, member.id, ctx.guild.name, ctx.guild.id, ctx.author.name, ctx.author.id)
 
     embed = discord.Embed(
         title=f'{member} User Information',
@@ -1472,95 +2029,65 @@ async def userinfo(ctx, member: Optional[discord.Member] = None):
     embed.add_field(name='Username', value=member.name, inline=True)
     embed.add_field(name='User ID', value=member.id, inline=True)
     embed.add_field(name='Nickname', value=member.nick or 'None', inline=True)
-    embed.add_field(name='Account Created', value=member.created_at.strftime('%B %d, %Y'), inline=True)
+    embed.add_field(name='Account Created', value=_fmt_date(member.created_at.timestamp()), inline=True)
 
     if member.joined_at:
-        embed.add_field(name='Joined Server', value=member.joined_at.strftime('%B %d, %Y'), inline=True)
+        embed.add_field(name='Joined Server', value=_fmt_date(member.joined_at.timestamp()), inline=True)
     else:
         embed.add_field(name='Joined Server', value='Unknown', inline=True)
 
     embed.add_field(name='Top Role', value=member.top_role.mention, inline=True)
 
     roles = [role.mention for role in member.roles if role.name != '@everyone']
-    if roles:
-        # Discord embed field value limit is 1024 characters
-        # Join all roles and check if it fits in one field
-        all_roles_text = ' '.join(roles)
-        
-        if len(all_roles_text) <= 1024:
-            # All roles fit in one field
-            embed.add_field(name=f'Roles [{len(roles)}]', value=all_roles_text, inline=False)
-        else:
-            # Need to split into multiple fields
-            # Each field can hold up to 1024 characters
-            role_text = ''
-            field_num = 1
-            for role_mention in roles:
-                # Handle edge case: if a single role is too long, truncate it
-                if len(role_mention) > 1024:
-                    # If we have accumulated text, save it first
-                    if role_text:
-                        embed.add_field(
-                            name=f'Roles [{len(roles)}] (Part {field_num})' if field_num == 1 else f'Roles (Part {field_num})',
-                            value=role_text,
-                            inline=False
-                        )
-                        role_text = ''
-                        field_num += 1
-                    # Add the truncated role in its own field
-                    truncated_role = role_mention[:1021] + '...'
-                    embed.add_field(
-                        name=f'Roles [{len(roles)}] (Part {field_num})' if field_num == 1 else f'Roles (Part {field_num})',
-                        value=truncated_role,
-                        inline=False
-                    )
-                    field_num += 1
-                    continue
-                
-                # Check if adding this role would exceed the limit
-                test_text = role_text + (' ' if role_text else '') + role_mention
-                if len(test_text) > 1024:
-                    # Save current field and start a new one (only if role_text is not empty)
-                    if role_text:
-                        embed.add_field(
-                            name=f'Roles [{len(roles)}] (Part {field_num})' if field_num == 1 else f'Roles (Part {field_num})',
-                            value=role_text,
-                            inline=False
-                        )
-                        field_num += 1
-                    role_text = role_mention
-                else:
-                    role_text = test_text
-            
-            # Add the last field if there's remaining content
-            if role_text:
-                embed.add_field(
-                    name=f'Roles [{len(roles)}] (Part {field_num})' if field_num == 1 else f'Roles (Part {field_num})',
-                    value=role_text,
-                    inline=False
-                )
+    # Length of ' '.join(roles), measured without building the string
+    total_len = sum(map(len, roles)) + max(0, len(roles) - 1)
+    if roles and total_len <= 1024:
+        # Common case: all roles fit in one field
+        embed.add_field(name=f'Roles [{len(roles)}]', value=' '.join(roles), inline=False)
+    elif roles:
+        # Discord embed field value limit is 1024 characters; pack the
+        # mentions into as few fields as possible in a single pass
+        chunks = []
+        current = []
+        current_len = 0
+        for role_mention in roles:
+            # Handle edge case: a single role that is too long gets truncated
+            if len(role_mention) > 1024:
+                role_mention = role_mention[:1021] + '...'
+            added = len(role_mention) + (1 if current else 0)  # +1 for the separator
+            if current and current_len + added > 1024:
+                chunks.append(' '.join(current))
+                current = [role_mention]
+                current_len = len(role_mention)
+            else:
+                current.append(role_mention)
+                current_len += added
+        chunks.append(' '.join(current))
+
+        for field_num, chunk in enumerate(chunks, 1):
+            embed.add_field(
+                name=f'Roles [{len(roles)}] (Part {field_num})' if field_num == 1 else f'Roles (Part {field_num})',
+                value=chunk,
+                inline=False
+            )
     else:
         embed.add_field(name='Roles [0]', value='No roles', inline=False)
 
     # Add warning count
-    guild_id = str(ctx.guild.id)
-    user_id = str(member.id)
-    warning_count = 0
-    if guild_id in warnings_data and user_id in warnings_data[guild_id]:
-        warning_count = warnings_data[guild_id][user_id]
+    warning_count = warnings_data.get(ctx.guild.id, {}).get(member.id, 0)
     embed.add_field(name='Warnings', value=str(warning_count), inline=True)
 
     await ctx.send(embed=embed)
-    command_logger.info(f"userinfo: SUCCESS - Displayed info for user {member.name} (ID: {member.id}) with {len(roles)} roles in guild {ctx.guild.name} (ID: {ctx.guild.id})")
+    command_logger.info("userinfo: SUCCESS - Displayed info for user %s (ID: %s) with %s roles in guild %s (ID: %s)", member.name, member.id, len(roles), ctx.guild.name, ctx.guild.id)
 
 @bot.hybrid_command(name='ping', description='Test if the bot is responding')
 async def ping(ctx):
     """Simple ping command to test bot responsiveness."""
     latency = round(bot.latency * 1000)
-    command_logger.info(f"ping: Requested by {ctx.author.name} (ID: {ctx.author.id}) in guild {ctx.guild.name if ctx.guild else 'DM'} (ID: {ctx.guild.id if ctx.guild else 'N/A'}) - Latency: {latency}ms")
+    command_logger.info("ping: Requested by %s (ID: %s) in guild %s (ID: %s) - Latency: %sms", ctx.author.name, ctx.author.id, ctx.guild.name if ctx.guild else 'DM', ctx.guild.id if ctx.guild else 'N/A', latency)
     await ctx.send(f'🏓 Pong! Latency: {latency}ms')
 
-@bot.command(name='work')
+@bot.command(name='work', extras={'owner_only': True})
 async def work_command(ctx):
     """Enable the bot - Owner only command."""
     global botEnabled
@@ -1568,23 +2095,20 @@ async def work_command(ctx):
     # Check owner permission
     if not is_owner(ctx.author.id):
         await ctx.send('❌ You do not have permission to use this command.')
-        command_logger.warning(f"work: Permission denied for {ctx.author.name} (ID: {ctx.author.id}), expected owner: {MAIN_OWNER_ID}")
+        command_logger.warning("work: Permission denied for %s (ID: %s), expected owner: %s", ctx.author.name, ctx.author.id, MAIN_OWNER_ID)
         return
     
     # Enable the bot
     botEnabled = True
     
     # Save state to file
-    save_bot_state({'enabled': True})
+    await save_bot_state({'enabled': True})
     
     await ctx.send('✅ **Bot is now ENABLED!** All commands are active.')
-    command_logger.info(f"BOT STATUS: Bot enabled by {ctx.author.name} (ID: {ctx.author.id})")
-    logger.info(f"Bot enabled by owner {ctx.author.name} (ID: {ctx.author.id}) - State persisted")
+    command_logger.info("BOT STATUS: Bot enabled by %s (ID: %s)", ctx.author.name, ctx.author.id)
+    logger.info("Bot enabled by owner %s (ID: %s) - State persisted", ctx.author.name, ctx.author.id)
 
-# Mark work command as owner-only
-work_command.owner_only = True
-
-@bot.command(name='stop')
+@bot.command(name='stop', extras={'owner_only': True})
 async def stop_command(ctx):
     """Disable the bot - Owner only command."""
     global botEnabled
@@ -1592,36 +2116,36 @@ async def stop_command(ctx):
     # Check owner permission
     if not is_owner(ctx.author.id):
         await ctx.send('❌ You do not have permission to use this command.')
-        command_logger.warning(f"stop: Permission denied for {ctx.author.name} (ID: {ctx.author.id}), expected owner: {MAIN_OWNER_ID}")
+        command_logger.warning("stop: Permission denied for %s (ID: %s), expected owner: %s", ctx.author.name, ctx.author.id, MAIN_OWNER_ID)
         return
     
     # Disable the bot
     botEnabled = False
     
     # Save state to file
-    save_bot_state({'enabled': False})
+    await save_bot_state({'enabled': False})
     
     await ctx.send('🔴 **Bot is now DISABLED!** All commands are inactive except Swork.')
-    command_logger.info(f"BOT STATUS: Bot disabled by {ctx.author.name} (ID: {ctx.author.id})")
-    logger.info(f"Bot disabled by owner {ctx.author.name} (ID: {ctx.author.id}) - State persisted")
+    command_logger.info("BOT STATUS: Bot disabled by %s (ID: %s)", ctx.author.name, ctx.author.id)
+    logger.info("Bot disabled by owner %s (ID: %s) - State persisted", ctx.author.name, ctx.author.id)
 
-# Mark stop command as owner-only
-stop_command.owner_only = True
+# The help embed only depends on the registered commands, which are fixed once
+# the module has loaded, so it is built on first use and reused afterwards
+_help_embed_cache: Optional[discord.Embed] = None
 
-@bot.hybrid_command(name='help', description='Display all available commands')
-async def help_command(ctx):
-    command_logger.info(f"help: Requested by {ctx.author.name} (ID: {ctx.author.id}) in guild {ctx.guild.name if ctx.guild else 'DM'} (ID: {ctx.guild.id if ctx.guild else 'N/A'})")
+def build_help_embed() -> discord.Embed:
+    """Build the /help embed."""
+    # Count prefix and slash commands by name, excluding owner-only commands;
+    # hybrid commands appear in both lists but are only counted once
+    command_names = {cmd.name for cmd in bot.commands if not cmd.extras.get('owner_only')}
+    command_names.update(cmd.name for cmd in bot.tree.get_commands() if not cmd.extras.get('owner_only'))
 
-    # Get all commands, excluding owner-only commands
-    all_commands = [cmd for cmd in bot.commands if not hasattr(cmd, 'owner_only') or not cmd.owner_only]
-    all_hybrid_commands = [cmd for cmd in bot.tree.get_commands() if not hasattr(cmd, 'owner_only') or not cmd.owner_only]
-    
-    total_commands = len(all_commands) + len(all_hybrid_commands)
+    total_commands = len(command_names)
 
     embed = discord.Embed(
         title=f'Bot Commands ({total_commands} total)',
         description='Commands can be used with `/` (slash) or `S` (prefix)',
-        color=discord.Color.blue()
+        color=_COLOR_BLUE
     )
 
     embed.add_field(
@@ -1663,82 +2187,131 @@ async def help_command(ctx):
         inline=False
     )
 
-    await ctx.send(embed=embed)
+    return embed
+
+@bot.hybrid_command(name='help', description='Display all available commands')
+async def help_command(ctx):
+    global _help_embed_cache
+    command_logger.info("help: Requested by %s (ID: %s) in guild %s (ID: %s)", ctx.author.name, ctx.author.id, ctx.guild.name if ctx.guild else 'DM', ctx.guild.id if ctx.guild else 'N/A')
+
+    if _help_embed_cache is None:
+        _help_embed_cache = build_help_embed()
+    await ctx.send(embed=_help_embed_cache)
 
 # Security event handlers
+@bot.event
+async def on_guild_join(guild: discord.Guild):
+    """Build the anti-spam exemption set for a newly joined guild."""
+    rebuild_spam_exempt(guild)
+
+@bot.event
+async def on_member_update(before: discord.Member, after: discord.Member):
+    """Keep the anti-spam exemption set in sync with role changes."""
+    if before._roles == after._roles:
+        return
+    exempt = spam_exempt_members.get(after.guild.id)
+    if exempt is None:
+        return
+    if is_whitelisted(after):
+        exempt.add(after.id)
+    else:
+        exempt.discard(after.id)
+
 @bot.event
 async def on_member_ban(guild: discord.Guild, user: discord.User):
     """Track bans for anti-nuke."""
-    if not security_settings.get('antinuke_enabled', True):
+    if not botEnabled or not _SEC.antinuke_enabled:
         return
     
     # Get the member who performed the ban (from audit log)
     try:
-        async for entry in guild.audit_logs(limit=1, action=discord.AuditLogAction.ban):
-            if entry.target.id == user.id:
-                if isinstance(entry.user, discord.Member) and not is_whitelisted(entry.user):
-                    action_count = track_user_action(guild.id, entry.user.id, 'ban')
-                    if action_count >= security_settings.get('antinuke_kick_threshold', 3):
-                        await handle_antinuke_violation(guild, entry.user, action_count)
-                break
+        entries = await get_recent_audit(guild, discord.AuditLogAction.ban, user.id)
+        entry = find_audit_entry(entries, user.id)
+        if entry is not None:
+            if isinstance(entry.user, discord.Member) and not is_whitelisted(entry.user):
+                action_count = track_user_action(guild.id, entry.user.id, 'ban')
+                if action_count >= _SEC.antinuke_kick_threshold:
+                    await handle_antinuke_violation(guild, entry.user, action_count)
     except Exception as e:
-        logger.debug(f"Could not track ban action: {e}")
+        logger.debug("Could not track ban action: %s", e)
 
 @bot.event
 async def on_member_remove(member: discord.Member):
     """Track member removals (kicks) for anti-nuke."""
-    if not security_settings.get('antinuke_enabled', True):
+    exempt = spam_exempt_members.get(member.guild.id)
+    if exempt is not None:
+        exempt.discard(member.id)
+
+    if not botEnabled or not _SEC.antinuke_enabled:
         return
     
     try:
-        async for entry in member.guild.audit_logs(limit=1, action=discord.AuditLogAction.kick):
-            if entry.target.id == member.id:
-                if isinstance(entry.user, discord.Member) and not is_whitelisted(entry.user):
-                    action_count = track_user_action(member.guild.id, entry.user.id, 'kick')
-                    if action_count >= security_settings.get('antinuke_kick_threshold', 3):
-                        await handle_antinuke_violation(member.guild, entry.user, action_count)
-                break
+        entries = await get_recent_audit(member.guild, discord.AuditLogAction.kick, member.id)
+        entry = find_audit_entry(entries, member.id)
+        if entry is not None:
+            if isinstance(entry.user, discord.Member) and not is_whitelisted(entry.user):
+                action_count = track_user_action(member.guild.id, entry.user.id, 'kick')
+                if action_count >= _SEC.antinuke_kick_threshold:
+                    await handle_antinuke_violation(member.guild, entry.user, action_count)
     except Exception as e:
-        logger.debug(f"Could not track kick action: {e}")
+        logger.debug("Could not track kick action: %s", e)
 
 @bot.event
 async def on_guild_role_delete(role: discord.Role):
     """Track role deletions for anti-nuke."""
-    if not security_settings.get('antinuke_enabled', True):
+    # discord.py strips the deleted role from members without an update event
+    if role.id in _SEC.whitelisted_role_ids:
+        rebuild_spam_exempt(role.guild)
+    if role.name == MANAGER_ROLE_NAME:
+        invalidate_manager_roles(role.guild.id)
+
+    if not botEnabled or not _SEC.antinuke_enabled:
         return
     
     try:
-        async for entry in role.guild.audit_logs(limit=1, action=discord.AuditLogAction.role_delete):
-            if entry.target.id == role.id:
-                if isinstance(entry.user, discord.Member) and not is_whitelisted(entry.user):
-                    action_count = track_user_action(role.guild.id, entry.user.id, 'role_delete')
-                    if action_count >= security_settings.get('antinuke_kick_threshold', 3):
-                        await handle_antinuke_violation(role.guild, entry.user, action_count)
-                break
+        entries = await get_recent_audit(role.guild, discord.AuditLogAction.role_delete, role.id)
+        entry = find_audit_entry(entries, role.id)
+        if entry is not None:
+            if isinstance(entry.user, discord.Member) and not is_whitelisted(entry.user):
+                action_count = track_user_action(role.guild.id, entry.user.id, 'role_delete')
+                if action_count >= _SEC.antinuke_kick_threshold:
+                    await handle_antinuke_violation(role.guild, entry.user, action_count)
     except Exception as e:
-        logger.debug(f"Could not track role delete action: {e}")
+        logger.debug("Could not track role delete action: %s", e)
+
+@bot.event
+async def on_guild_role_create(role: discord.Role):
+    """Pick up a new role carrying the manager name (name fallback)."""
+    if role.name == MANAGER_ROLE_NAME:
+        invalidate_manager_roles(role.guild.id)
+
+@bot.event
+async def on_guild_role_update(before: discord.Role, after: discord.Role):
+    """Re-resolve the manager roles when a role is renamed (name fallback)."""
+    if MANAGER_ROLE_NAME in (before.name, after.name) and before.name != after.name:
+        invalidate_manager_roles(after.guild.id)
 
 @bot.event
 async def on_guild_channel_delete(channel: discord.abc.GuildChannel):
     """Track channel deletions for anti-nuke."""
-    if not security_settings.get('antinuke_enabled', True):
+    if not botEnabled or not _SEC.antinuke_enabled:
         return
     
     try:
-        async for entry in channel.guild.audit_logs(limit=1, action=discord.AuditLogAction.channel_delete):
-            if entry.target.id == channel.id:
-                if isinstance(entry.user, discord.Member) and not is_whitelisted(entry.user):
-                    action_count = track_user_action(channel.guild.id, entry.user.id, 'channel_delete')
-                    if action_count >= security_settings.get('antinuke_kick_threshold', 3):
-                        await handle_antinuke_violation(channel.guild, entry.user, action_count)
-                break
+        entries = await get_recent_audit(channel.guild, discord.AuditLogAction.channel_delete, channel.id)
+        entry = find_audit_entry(entries, channel.id)
+        if entry is not None:
+            if isinstance(entry.user, discord.Member) and not is_whitelisted(entry.user):
+                action_count = track_user_action(channel.guild.id, entry.user.id, 'channel_delete')
+                if action_count >= _SEC.antinuke_kick_threshold:
+                    await handle_antinuke_violation(channel.guild, entry.user, action_count)
     except Exception as e:
-        logger.debug(f"Could not track channel delete action: {e}")
+        logger.debug("Could not track channel delete action: %s", e)
 
 @bot.event
 async def on_bulk_message_delete(messages: List[discord.Message]):
     """Track bulk message deletions for anti-nuke."""
-    if not security_settings.get('antinuke_enabled', True) or not messages:
+    if not botEnabled or not _SEC.antinuke_enabled or not messages:
         return
     
     guild = messages[0].guild
@@ -1746,17 +2319,54 @@ async def on_bulk_message_delete(messages: List[discord.Message]):
         return
     
     try:
-        async for entry in guild.audit_logs(limit=1, action=discord.AuditLogAction.message_bulk_delete):
+        # The bulk-delete audit entry targets the channel the messages were in
+        channel_id = messages[0].channel.id
+        entries = await get_recent_audit(guild, discord.AuditLogAction.message_bulk_delete, channel_id)
+        entry = find_audit_entry(entries, channel_id)
+        if entry is not None:
             if isinstance(entry.user, discord.Member) and not is_whitelisted(entry.user):
                 action_count = track_user_action(guild.id, entry.user.id, 'bulk_delete')
-                if action_count >= security_settings.get('antinuke_kick_threshold', 3):
+                if action_count >= _SEC.antinuke_kick_threshold:
                     await handle_antinuke_violation(guild, entry.user, action_count)
-            break
     except Exception as e:
-        logger.debug(f"Could not track bulk delete action: {e}")
+        logger.debug("Could not track bulk delete action: %s", e)
 
 # Security configuration commands
-@bot.hybrid_command(name='antinuke', description='Configure anti-nuke protection settings', default_member_permissions=discord.Permissions(administrator=True))
+def update_security_setting(key: str, value) -> None:
+    """Set security_settings[key], marking it dirty only if the value actually changed."""
+    if key in security_settings and security_settings[key] == value:
+        return
+    security_settings[key] = value
+    mark_security_dirty()
+
+async def _set_positive_int(ctx, value: str, *, key: str, min_error: str, done: str) -> None:
+    """Store `value` under security_settings[key] if it is an integer >= 1; `done` is formatted with it."""
+    try:
+        number = int(value)
+    except ValueError:
+        await ctx.send('❌ Invalid number. Please provide a valid integer.')
+        return
+    if number < 1:
+        await ctx.send(min_error)
+        return
+    update_security_setting(key, number)
+    await ctx.send(done.format(number))
+
+def build_antinuke_embed() -> discord.Embed:
+    """Build the /antinuke settings embed from the _SEC snapshot."""
+    sc = _SEC
+    return discord.Embed.from_dict({
+        'title': '🛡️ Anti-Nuke Protection Settings',
+        'color': _COLOR_BLUE.value,
+        'fields': [
+            {'name': 'Status', 'value': '✅ Enabled' if sc.antinuke_enabled else '❌ Disabled', 'inline': True},
+            {'name': 'Ban Threshold', 'value': f'{sc.antinuke_ban_threshold} actions', 'inline': True},
+            {'name': 'Kick Threshold', 'value': f'{sc.antinuke_kick_threshold} actions', 'inline': True},
+            {'name': 'Time Window', 'value': f'{sc.antinuke_time_window} seconds', 'inline': True},
+        ],
+    })
+
+@bot.hybrid_command(name='antinuke', description='Configure anti-nuke protection settings', default_member_permissions=_ADMIN_PERMS)
 @commands.has_permissions(administrator=True)
 async def antinuke_config(ctx, action: str = None, value: str = None):
     """Configure anti-nuke protection."""
@@ -1766,64 +2376,57 @@ async def antinuke_config(ctx, action: str = None, value: str = None):
     
     if action is None:
         # Show current settings
-        embed = discord.Embed(
-            title='🛡️ Anti-Nuke Protection Settings',
-            color=discord.Color.blue()
-        )
-        embed.add_field(name='Status', value='✅ Enabled' if security_settings.get('antinuke_enabled', True) else '❌ Disabled', inline=True)
-        embed.add_field(name='Ban Threshold', value=f"{security_settings.get('antinuke_ban_threshold', 5)} actions", inline=True)
-        embed.add_field(name='Kick Threshold', value=f"{security_settings.get('antinuke_kick_threshold', 3)} actions", inline=True)
-        embed.add_field(name='Time Window', value=f"{security_settings.get('antinuke_time_window', 10)} seconds", inline=True)
-        await ctx.send(embed=embed)
+        global _antinuke_embed_cache
+        if _antinuke_embed_cache is None:
+            _antinuke_embed_cache = build_antinuke_embed()
+        await ctx.send(embed=_antinuke_embed_cache)
         return
     
-    action = action.lower()
+    action = _lc(action)
     
     if action == 'enable':
-        security_settings['antinuke_enabled'] = True
-        save_security_settings(security_settings)
+        update_security_setting('antinuke_enabled', True)
         await ctx.send('✅ Anti-nuke protection enabled!')
     elif action == 'disable':
-        security_settings['antinuke_enabled'] = False
-        save_security_settings(security_settings)
+        update_security_setting('antinuke_enabled', False)
         await ctx.send('❌ Anti-nuke protection disabled!')
     elif action == 'banthreshold' and value:
-        try:
-            threshold = int(value)
-            if threshold < 1:
-                await ctx.send('❌ Threshold must be at least 1.')
-                return
-            security_settings['antinuke_ban_threshold'] = threshold
-            save_security_settings(security_settings)
-            await ctx.send(f'✅ Ban threshold set to {threshold} actions.')
-        except ValueError:
-            await ctx.send('❌ Invalid number. Please provide a valid integer.')
+        await _set_positive_int(ctx, value, key='antinuke_ban_threshold', min_error='❌ Threshold must be at least 1.', done='✅ Ban threshold set to {} actions.')
     elif action == 'kickthreshold' and value:
-        try:
-            threshold = int(value)
-            if threshold < 1:
-                await ctx.send('❌ Threshold must be at least 1.')
-                return
-            security_settings['antinuke_kick_threshold'] = threshold
-            save_security_settings(security_settings)
-            await ctx.send(f'✅ Kick threshold set to {threshold} actions.')
-        except ValueError:
-            await ctx.send('❌ Invalid number. Please provide a valid integer.')
+        await _set_positive_int(ctx, value, key='antinuke_kick_threshold', min_error='❌ Threshold must be at least 1.', done='✅ Kick threshold set to {} actions.')
     elif action == 'timewindow' and value:
-        try:
-            window = int(value)
-            if window < 1:
-                await ctx.send('❌ Time window must be at least 1 second.')
-                return
-            security_settings['antinuke_time_window'] = window
-            save_security_settings(security_settings)
-            await ctx.send(f'✅ Time window set to {window} seconds.')
-        except ValueError:
-            await ctx.send('❌ Invalid number. Please provide a valid integer.')
+        await _set_positive_int(ctx, value, key='antinuke_time_window', min_error='❌ Time window must be at least 1 second.', done='✅ Time window set to {} seconds.')
     else:
         await ctx.send('❌ Invalid action. Use: `enable`, `disable`, `banthreshold <number>`, `kickthreshold <number>`, or `timewindow <seconds>`')
 
-@bot.hybrid_command(name='antispam', description='Configure anti-spam protection settings', default_member_permissions=discord.Permissions(administrator=True))
+_VALID_ANTISPAM_ACTIONS = frozenset(('mute', 'kick', 'ban'))
+
+# /antispam actions: name -> (handler, needs_value)
+def _antispam_toggle(enabled: bool):
+    async def handler(ctx, value):
+        update_security_setting('antispam_enabled', enabled)
+        await ctx.send('✅ Anti-spam protection enabled!' if enabled else '❌ Anti-spam protection disabled!')
+    return handler
+
+async def _antispam_set_action(ctx, value):
+    value = _lc(value)
+    if value in _VALID_ANTISPAM_ACTIONS:
+        update_security_setting('antispam_action', value)
+        await ctx.send(f'✅ Anti-spam action set to {value}.')
+    else:
+        await ctx.send('❌ Invalid action. Use: `mute`, `kick`, or `ban`')
+
+_ANTISPAM_ACTIONS = {
+    'enable': (_antispam_toggle(True), False),
+    'disable': (_antispam_toggle(False), False),
+    'messagelimit': (functools.partial(_set_positive_int, key='antispam_message_limit', min_error='❌ Limit must be at least 1.', done='✅ Message limit set to {} messages.'), True),
+    'mentionlimit': (functools.partial(_set_positive_int, key='antispam_mention_limit', min_error='❌ Limit must be at least 1.', done='✅ Mention limit set to {} mentions.'), True),
+    'duplicatelimit': (functools.partial(_set_positive_int, key='antispam_duplicate_limit', min_error='❌ Limit must be at least 1.', done='✅ Duplicate limit set to {} messages.'), True),
+    'action': (_antispam_set_action, True),
+    'muteduration': (functools.partial(_set_positive_int, key='antispam_mute_duration', min_error='❌ Duration must be at least 1 minute.', done='✅ Mute duration set to {} minutes.'), True),
+}
+
+@bot.hybrid_command(name='antispam', description='Configure anti-spam protection settings', default_member_permissions=_ADMIN_PERMS)
 @commands.has_permissions(administrator=True)
 async def antispam_config(ctx, action: str = None, value: str = None):
     """Configure anti-spam protection."""
@@ -1835,83 +2438,27 @@ async def antispam_config(ctx, action: str = None, value: str = None):
         # Show current settings
         embed = discord.Embed(
             title='🚫 Anti-Spam Protection Settings',
-            color=discord.Color.blue()
+            color=_COLOR_BLUE
         )
-        embed.add_field(name='Status', value='✅ Enabled' if security_settings.get('antispam_enabled', True) else '❌ Disabled', inline=True)
-        embed.add_field(name='Message Limit', value=f"{security_settings.get('antispam_message_limit', 5)} per {security_settings.get('antispam_time_window', 5)}s", inline=True)
-        embed.add_field(name='Mention Limit', value=f"{security_settings.get('antispam_mention_limit', 5)} per message", inline=True)
-        embed.add_field(name='Duplicate Limit', value=f"{security_settings.get('antispam_duplicate_limit', 3)} messages", inline=True)
-        embed.add_field(name='Action', value=security_settings.get('antispam_action', 'mute').title(), inline=True)
-        embed.add_field(name='Mute Duration', value=f"{security_settings.get('antispam_mute_duration', 10)} minutes", inline=True)
+        sc = _SEC  # Defaults are already applied in the snapshot
+        embed.add_field(name='Status', value='✅ Enabled' if sc.antispam_enabled else '❌ Disabled', inline=True)
+        embed.add_field(name='Message Limit', value=f"{sc.message_limit} per {sc.time_window}s", inline=True)
+        embed.add_field(name='Mention Limit', value=f"{sc.mention_limit} per message", inline=True)
+        embed.add_field(name='Duplicate Limit', value=f"{sc.duplicate_limit} messages", inline=True)
+        embed.add_field(name='Action', value=sc.action.title(), inline=True)
+        embed.add_field(name='Mute Duration', value=f"{sc.mute_duration} minutes", inline=True)
         await ctx.send(embed=embed)
         return
     
-    action = action.lower()
-    
-    if action == 'enable':
-        security_settings['antispam_enabled'] = True
-        save_security_settings(security_settings)
-        await ctx.send('✅ Anti-spam protection enabled!')
-    elif action == 'disable':
-        security_settings['antispam_enabled'] = False
-        save_security_settings(security_settings)
-        await ctx.send('❌ Anti-spam protection disabled!')
-    elif action == 'messagelimit' and value:
-        try:
-            limit = int(value)
-            if limit < 1:
-                await ctx.send('❌ Limit must be at least 1.')
-                return
-            security_settings['antispam_message_limit'] = limit
-            save_security_settings(security_settings)
-            await ctx.send(f'✅ Message limit set to {limit} messages.')
-        except ValueError:
-            await ctx.send('❌ Invalid number. Please provide a valid integer.')
-    elif action == 'mentionlimit' and value:
-        try:
-            limit = int(value)
-            if limit < 1:
-                await ctx.send('❌ Limit must be at least 1.')
-                return
-            security_settings['antispam_mention_limit'] = limit
-            save_security_settings(security_settings)
-            await ctx.send(f'✅ Mention limit set to {limit} mentions.')
-        except ValueError:
-            await ctx.send('❌ Invalid number. Please provide a valid integer.')
-    elif action == 'duplicatelimit' and value:
-        try:
-            limit = int(value)
-            if limit < 1:
-                await ctx.send('❌ Limit must be at least 1.')
-                return
-            security_settings['antispam_duplicate_limit'] = limit
-            save_security_settings(security_settings)
-            await ctx.send(f'✅ Duplicate limit set to {limit} messages.')
-        except ValueError:
-            await ctx.send('❌ Invalid number. Please provide a valid integer.')
-    elif action == 'action' and value:
-        value = value.lower()
-        if value in ['mute', 'kick', 'ban']:
-            security_settings['antispam_action'] = value
-            save_security_settings(security_settings)
-            await ctx.send(f'✅ Anti-spam action set to {value}.')
-        else:
-            await ctx.send('❌ Invalid action. Use: `mute`, `kick`, or `ban`')
-    elif action == 'muteduration' and value:
-        try:
-            duration = int(value)
-            if duration < 1:
-                await ctx.send('❌ Duration must be at least 1 minute.')
-                return
-            security_settings['antispam_mute_duration'] = duration
-            save_security_settings(security_settings)
-            await ctx.send(f'✅ Mute duration set to {duration} minutes.')
-        except ValueError:
-            await ctx.send('❌ Invalid number. Please provide a valid integer.')
-    else:
+    action = _lc(action)
+
+    handler, needs_value = _ANTISPAM_ACTIONS.get(action, (None, False))
+    if handler is None or (needs_value and not value):
         await ctx.send('❌ Invalid action. Use: `enable`, `disable`, `messagelimit <number>`, `mentionlimit <number>`, `duplicatelimit <number>`, `action <mute/kick/ban>`, or `muteduration <minutes>`')
+        return
+    await handler(ctx, value)
 
-@bot.hybrid_command(name='securitywhitelist', description='Manage security whitelist (roles exempt from protection)', default_member_permissions=discord.Permissions(administrator=True))
+@bot.hybrid_command(name='securitywhitelist', description='Manage security whitelist (roles exempt from protection)', default_member_permissions=_ADMIN_PERMS)
 @commands.has_permissions(administrator=True)
 async def security_whitelist(ctx, action: str = None, role: discord.Role = None):
     """Manage security whitelist."""
@@ -1920,57 +2467,56 @@ async def security_whitelist(ctx, action: str = None, role: discord.Role = None)
         return
     
     if action is None:
-        whitelisted = security_settings.get('whitelisted_roles', [])
+        # _SEC holds the whitelist already parsed to ints
+        whitelisted = sorted(_SEC.whitelisted_role_ids)
         if not whitelisted:
             await ctx.send('📋 No roles are whitelisted.')
         else:
-            roles_list = []
-            for role_id in whitelisted:
-                role_obj = ctx.guild.get_role(int(role_id))
-                if role_obj:
-                    roles_list.append(role_obj.mention)
+            get_role = ctx.guild.get_role
+            roles_list = [r.mention for r in map(get_role, whitelisted) if r]
             if roles_list:
                 await ctx.send(f'📋 Whitelisted roles: {", ".join(roles_list)}')
             else:
-                await ctx.send('📋 Whitelisted role IDs: {", ".join(whitelisted)}')
+                await ctx.send(f'📋 Whitelisted role IDs: {", ".join(map(str, whitelisted))}')
         return
     
-    action = action.lower()
+    action = _lc(action)
     
+    # Membership is checked against the _SEC set; the stored list of string IDs
+    # is only touched when it actually changes
     if action == 'add' and role:
-        whitelisted = security_settings.get('whitelisted_roles', [])
-        if str(role.id) not in whitelisted:
-            whitelisted.append(str(role.id))
-            security_settings['whitelisted_roles'] = whitelisted
-            await save_security_settings(security_settings)
+        if role.id not in _SEC.whitelisted_role_ids:
+            security_settings.setdefault('whitelisted_roles', []).append(str(role.id))
+            mark_security_dirty()
+            rebuild_all_spam_exempt()
             await ctx.send(f'✅ Added {role.mention} to security whitelist.')
         else:
             await ctx.send(f'❌ {role.mention} is already whitelisted.')
     elif action == 'remove' and role:
-        whitelisted = security_settings.get('whitelisted_roles', [])
-        if str(role.id) in whitelisted:
-            whitelisted.remove(str(role.id))
-            security_settings['whitelisted_roles'] = whitelisted
-            await save_security_settings(security_settings)
+        if role.id in _SEC.whitelisted_role_ids:
+            security_settings['whitelisted_roles'] = [rid for rid in security_settings['whitelisted_roles'] if int(rid) != role.id]
+            mark_security_dirty()
+            rebuild_all_spam_exempt()
             await ctx.send(f'✅ Removed {role.mention} from security whitelist.')
         else:
             await ctx.send(f'❌ {role.mention} is not whitelisted.')
     else:
         await ctx.send('❌ Invalid action. Use: `add <role>` or `remove <role>`')
 
+# Checked by run_bot_with_error_handling when bot.run() returns
+bot.restart_requested = False
+
 async def restart_bot():
-    """Restart the bot gracefully."""
+    """Restart the bot gracefully, reconnecting within the same process."""
     logger.info("Restarting bot...")
+    bot.restart_requested = True
     try:
-        # Close the bot session cleanly
+        # Close the bot session cleanly; bot.run() then returns and the run
+        # loop starts it again, without re-importing everything via exec
         if not bot.is_closed():
             await bot.close()
-        # Wait a moment for cleanup
-        await asyncio.sleep(2)
     except Exception as e:
-        logger.warning(f"Error during bot close: {e}")
-    # Restart the process
-    os.execv(sys.executable, ['python'] + sys.argv)
+        logger.warning("Error during bot close: %s", e)
 
 if __name__ == '__main__':
     import sys
@@ -1986,12 +2532,6 @@ if __name__ == '__main__':
         ]
     )
     
-    # Start webserver
-    webserver_thread = keep_alive()
-    if not webserver_thread:
-        logger.error("Failed to start webserver")
-        sys.exit(1)
-    
     try:
         from config import TOKEN
     except ImportError:
@@ -2018,6 +2558,6 @@ if __name__ == '__main__':
 
     # Use centralized error handling for bot
     def emergency_save():
-        save_warnings_sync(warnings_data)
+        flush_pending_saves_sync()
 
     run_bot_with_error_handling(bot, TOKEN, on_shutdown=emergency_save)
\ No newline at end of file
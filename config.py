@@ -15,6 +15,10 @@ if not TOKEN:
 # Replace with your actual Discord User ID
 MAIN_OWNER_ID = os.getenv('MAIN_OWNER_ID', '841264751320760331')
 
+# Development / single-server mode: when set, slash commands are synced to this
+# guild only, where updates apply instantly, and the global sync is skipped
+DEV_GUILD_ID = os.getenv('DEV_GUILD_ID')
+
 # Role-based permission settings
 # Either set MANAGER_ROLE_NAME to the role name that should be allowed to run
 # role-management commands, or set MANAGER_ROLE_IDS to a list of role IDs.
@@ -3,10 +3,25 @@ import time
 import logging
 import discord
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 
 # Get logger from the main bot module
 logger = logging.getLogger(__name__)
 
+# Runs on_shutdown saves so they overlap the reconnect backoff sleep
+_save_executor = ThreadPoolExecutor(max_workers=1)
+
+
+def _bump_retry_or_exit(retry_count, limit=5, delay=5):
+    """Count a restart attempt and wait before it, or exit once `limit` is reached."""
+    if retry_count < limit:
+        retry_count += 1
+        logger.info(f"Attempting restart... (Attempt {retry_count})")
+        time.sleep(delay)
+        return retry_count
+    logger.error("Too many restart attempts. Exiting.")
+    sys.exit(1)
+
 
 def run_bot_with_error_handling(bot, TOKEN, on_shutdown=None):
     """
@@ -22,6 +37,14 @@ def run_bot_with_error_handling(bot, TOKEN, on_shutdown=None):
         try:
             logger.info("Starting bot...")
             bot.run(TOKEN)
+            # bot.run() returns once the bot has been closed cleanly
+            if getattr(bot, 'restart_requested', False):
+                bot.restart_requested = False
+                logger.info("Restart requested, reconnecting...")
+                bot.clear()  # Reset the closed client so it can connect again
+                continue
+            logger.info("Bot stopped")
+            break
         except discord.errors.PrivilegedIntentsRequired:
             logger.error("ERROR: Privileged Intents Not Enabled!")
             logger.error("Please enable MESSAGE CONTENT INTENT and SERVER MEMBERS INTENT")
@@ -55,16 +78,17 @@ def run_bot_with_error_handling(bot, TOKEN, on_shutdown=None):
             error_msg = str(e)
             if "Session is closed" in error_msg or "session" in error_msg.lower():
                 logger.warning(f"Session was closed. Attempting to reconnect...")
-                # Save data before retry
-                if on_shutdown:
+                # Save data before retry, in the background while we wait
+                save_future = _save_executor.submit(on_shutdown) if on_shutdown else None
+                
+                # Wait and retry
+                time.sleep(5)
+                if save_future is not None:
                     try:
-                        on_shutdown()
+                        save_future.result(timeout=5)
                         logger.info("Data saved before reconnection attempt")
                     except Exception as save_error:
                         logger.error(f"Failed to save data: {save_error}")
-                
-                # Wait and retry
-                time.sleep(5)
                 if retry_count < 3:
                     retry_count += 1
                     logger.info(f"Reconnection attempt {retry_count}/3...")
@@ -74,13 +98,7 @@ def run_bot_with_error_handling(bot, TOKEN, on_shutdown=None):
                     sys.exit(1)
             else:
                 logger.error(f"Runtime error: {e}")
-                if retry_count < 5:
-                    retry_count += 1
-                    logger.info(f"Attempting restart... (Attempt {retry_count})")
-                    time.sleep(5)
-                else:
-                    logger.error("Too many restart attempts. Exiting.")
-                    sys.exit(1)
+                retry_count = _bump_retry_or_exit(retry_count)
         except discord.ClientException as e:
             error_msg = str(e)
             if "Session is closed" in error_msg or "session" in error_msg.lower():
@@ -88,13 +106,7 @@ def run_bot_with_error_handling(bot, TOKEN, on_shutdown=None):
                 time.sleep(3)  # Wait for cleanup
             else:
                 logger.error(f"Client error: {e}")
-            if retry_count < 5:
-                retry_count += 1
-                logger.info(f"Attempting restart... (Attempt {retry_count})")
-                time.sleep(5)
-            else:
-                logger.error("Too many restart attempts. Exiting.")
-                sys.exit(1)
+            retry_count = _bump_retry_or_exit(retry_count)
         except KeyboardInterrupt:
             logger.info("Bot shutdown requested by user")
             try:
@@ -124,10 +136,4 @@ def run_bot_with_error_handling(bot, TOKEN, on_shutdown=None):
                 except Exception:
                     pass
                 time.sleep(3)
-            if retry_count < 5:
-                retry_count += 1
-                logger.info(f"Attempting restart... (Attempt {retry_count})")
-                time.sleep(5)
-            else:
-                logger.error("Too many restart attempts. Exiting.")
-                sys.exit(1)
\ No newline at end of file
+            retry_count = _bump_retry_or_exit(retry_count)
\ No newline at end of file
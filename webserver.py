@@ -1,14 +1,15 @@
-from flask import Flask
-from threading import Thread
+from aiohttp import web
+from typing import Optional
 import os
-import time
-import threading
+import logging
+
+logger = logging.getLogger('webserver')
 
-app = Flask(__name__)
+# Listen address from environment variables with fallbacks, resolved once
+_PORT = int(os.getenv('PORT', os.getenv('SERVER_PORT', 30055)))
+_HOST = os.getenv('SERVER_HOST', '0.0.0.0')
 
-@app.route('/')
-def home():
-    return '''
+HOME_PAGE = '''
     <html>
         <head><title>Discord Bot Status</title></head>
         <body style="font-family: Arial; text-align: center; padding: 50px;">
@@ -19,63 +20,37 @@ def home():
     </html>
     '''
 
-@app.route('/health')
-def health():
-    return {'status': 'ok', 'bot': 'running'}, 200
-
-import logging
+async def home(request: web.Request) -> web.Response:
+    return web.Response(text=HOME_PAGE, content_type='text/html')
 
-logger = logging.getLogger('webserver')
+async def health(request: web.Request) -> web.Response:
+    return web.json_response({'status': 'ok', 'bot': 'running'})
 
-def run():
-    """Run the Flask web server."""
-    try:
-        # Get port from environment variables with fallbacks
-        port = int(os.getenv('PORT', os.getenv('SERVER_PORT', 30055)))
-        host = os.getenv('SERVER_HOST', '0.0.0.0')
-        
-        # Suppress Flask startup banner
-        import sys
-        cli = sys.modules['flask.cli']
-        cli.show_server_banner = lambda *x: None
-        
-        # Listen on configured host and port
-        app.run(
-            host=host,
-            port=port,
-            threaded=True,
-            debug=False,
-            use_reloader=False 
-        )
-    except Exception as e:
-        logger.error(f"Webserver Error: {str(e)}")
-        return None
+def create_app() -> web.Application:
+    """Build the status web application."""
+    app = web.Application()
+    app.router.add_get('/', home)
+    app.router.add_get('/health', health)
+    return app
 
-def keep_alive() -> Thread:
+async def start_webserver() -> Optional[web.AppRunner]:
     """
-    Start the webserver in a background thread.
-    
+    Serve the status pages on the running event loop.
+
     Returns:
-        Thread: The background thread running the webserver, or None if startup failed
+        web.AppRunner: The runner to clean up on shutdown, or None if startup failed
     """
+    runner = web.AppRunner(create_app(), access_log=None)
     try:
-        # Ensure we're not trying to start multiple servers
-        for thread in threading.enumerate():
-            if thread.name == 'WebserverThread':
-                logger.info("Webserver already running")
-                return thread
-                
-        t = Thread(target=run, daemon=True, name='WebserverThread')
-        t.start()
-        
-        # Wait for server to start
-        time.sleep(1)
-        logger.info(f"Webserver started on port {os.getenv('PORT', os.getenv('SERVER_PORT', 30055))}")
-        return t
+        await runner.setup()
+        await web.TCPSite(runner, _HOST, _PORT).start()
     except Exception as e:
-        logger.error(f"Failed to start webserver: {str(e)}")
+        logger.error("Failed to start webserver: %s", e)
+        await runner.cleanup()
         return None
+    logger.info("Webserver started on port %s", _PORT)
+    return runner
 
-# If this file is run directly, start the webserver
+# If this file is run directly, serve the status pages on their own
 if __name__ == '__main__':
-    keep_alive()
+    web.run_app(create_app(), host=_HOST, port=_PORT, access_log=None)